@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the organigram import tools
+Runs the importers on nodes.csv and on synthetic 10x/100x expansions of it
+"""
+
+import argparse
+import contextlib
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from hierarchy_builder import build_hierarchy
+from encoding_detection import detect_encoding
+from hierarchy_columnar import ColumnarHierarchy, write_columnar
+from hierarchy_model import HierarchyModel
+from hierarchy_store import HierarchyStore, write_store
+from hierarchy_writer import save_hierarchy_json
+from import_organigram import OrganigramImporter
+from import_cache import ImportCache
+from incremental_import import changes_path, manifest_path, save_incremental
+from import_organigram_simple import SimpleOrganigramImporter
+
+
+class LegacyImporter(OrganigramImporter):
+    """Reference copy of the original iterrows-based process_dataframe"""
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = {}
+        self.children_map = defaultdict(list)
+
+    def process_dataframe(self, df):
+        self.validate_columns(df)
+        for index, row in df.iterrows():
+            node_id = self.clean_field(row['id'])
+            pid = self.clean_field(row['pid'])
+            name = self.clean_field(row['name'])
+            level = self.clean_field(row['level'])
+            if not node_id or not name:
+                continue
+            self.nodes[node_id] = {'id': node_id, 'name': name, 'pid': pid, 'level': level, 'children': []}
+            if pid and pid != 'NULL':
+                self.children_map[pid].append(node_id)
+        for parent_id, child_ids in self.children_map.items():
+            if parent_id in self.nodes:
+                self.nodes[parent_id]['children'] = child_ids
+
+
+def legacy_load_csv(file_path):
+    """Reference copy of the original per-encoding retry loop around pd.read_csv"""
+    import pandas as pd
+    for encoding in ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']:
+        try:
+            return pd.read_csv(file_path, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+
+
+def legacy_load_rows(file_path):
+    """Reference copy of the simple importer's per-encoding retry loop"""
+    for encoding in ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']:
+        try:
+            with open(file_path, 'r', encoding=encoding, newline='') as file:
+                return list(csv.DictReader(file))
+        except UnicodeDecodeError:
+            continue
+
+
+def legacy_build_tree(node_id, nodes):
+    """Reference copy of the original recursive, copying build_tree"""
+    if node_id not in nodes:
+        return None
+    node = nodes[node_id].copy()
+    node['children'] = []
+    for child_id in nodes[node_id]['children']:
+        child_tree = legacy_build_tree(child_id, nodes)
+        if child_tree:
+            node['children'].append(child_tree)
+    return node
+
+
+def synthetic_tree(shape, size):
+    """Return (nodes, children_map) for a 'deep' chain or a 'wide' single-parent tree"""
+    nodes = {}
+    children_map = defaultdict(list)
+    for index in range(size):
+        node_id = str(index)
+        if index == 0:
+            pid = None
+        elif shape == 'deep':
+            pid = str(index - 1)
+        else:
+            pid = '0'
+        nodes[node_id] = {'id': node_id, 'name': f"Node {index}", 'pid': pid, 'level': f"l{min(index, 4)}", 'children': []}
+        if pid is not None:
+            children_map[pid].append(node_id)
+    for parent_id, child_ids in children_map.items():
+        nodes[parent_id]['children'] = child_ids
+    return nodes, children_map
+
+
+def measure(function, *args):
+    """Return (seconds, peak traced bytes, result or exception name)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    except RecursionError:
+        result = 'RecursionError'
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def expand_csv(source, factor, destination):
+    """Write `factor` copies of a catalog CSV, offsetting ids so each copy is its own tree"""
+    with open(source, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    offset = max(int(row['id']) for row in rows) + 1
+    with open(destination, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writeheader()
+        for copy in range(factor):
+            for row in rows:
+                row = dict(row)
+                row['id'] = str(int(row['id']) + copy * offset)
+                if row['pid'] and row['pid'] != 'NULL':
+                    row['pid'] = str(int(row['pid']) + copy * offset)
+                writer.writerow(row)
+    return destination
+
+
+def timed(function, *args):
+    """Run function with its console output suppressed, returning (seconds, result)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+    return elapsed, result
+
+
+@contextlib.contextmanager
+def synthetic_inputs(source, factors):
+    """Yield (label, path) for the source CSV and each expansion factor"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = []
+        for factor in factors:
+            if factor == 1:
+                inputs.append(('1x', source))
+            else:
+                path = os.path.join(tmp_dir, f"{Path(source).stem}_{factor}x.csv")
+                inputs.append((f"{factor}x", expand_csv(source, factor, path)))
+        yield inputs
+
+
+def bench_csv(args):
+    """Compare CSV processing paths: iterrows, vectorized, streaming"""
+    print(f"{'input':>6}{'rows':>12}{'iterrows':>12}{'vectorized':>12}{'streaming':>12}")
+    with synthetic_inputs(args.csv, args.factors) as inputs:
+        for label, path in inputs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = OrganigramImporter().load_csv(path)
+
+            if len(df) <= args.legacy_limit:
+                legacy, _ = timed(LegacyImporter().process_dataframe, df)
+                legacy_text = f"{legacy:>11.2f}s"
+            else:
+                legacy_text = f"{'skipped':>12}"
+
+            vectorized_importer = OrganigramImporter()
+            vectorized, _ = timed(vectorized_importer.process_dataframe, df)
+            streaming_importer = OrganigramImporter()
+            streaming, _ = timed(streaming_importer.process_csv_stream, path)
+            assert len(vectorized_importer.model) == len(streaming_importer.model)
+
+            print(f"{label:>6}{len(df):>12,}{legacy_text}{vectorized:>11.2f}s{streaming:>11.2f}s")
+    return 0
+
+
+def bench_tree(args):
+    """Recursive copying build_tree vs. the iterative shared builder"""
+    print(f"{'tree':<18}{'builder':<12}{'time':>10}{'peak memory':>16}")
+    for shape, size in [('deep', args.deep), ('wide', args.wide)]:
+        nodes, children_map = synthetic_tree(shape, size)
+        label = f"{shape} ({size:,})"
+
+        elapsed, peak, result = measure(legacy_build_tree, '0', nodes)
+        outcome = f"{result:>16}" if isinstance(result, str) else f"{peak / 1024 / 1024:>13.1f} MB"
+        print(f"{label:<18}{'recursive':<12}{elapsed:>9.3f}s{outcome}")
+
+        elapsed, peak, (roots, report) = measure(build_hierarchy, nodes, children_map)
+        assert len(roots) == 1 and not report['unreachable']
+        print(f"{label:<18}{'iterative':<12}{elapsed:>9.3f}s{peak / 1024 / 1024:>13.1f} MB")
+    return 0
+
+
+def load_nested(path):
+    """Parse nested hierarchy JSON and flatten it into an id -> node map, as the browser does"""
+    with open(path, 'r', encoding='utf-8') as f:
+        hierarchy = json.load(f)
+    flat = {}
+    stack = list(hierarchy)
+    while stack:
+        node = stack.pop()
+        flat[node['id']] = node
+        stack.extend(node['children'])
+    return flat
+
+
+def load_columnar(path):
+    """Parse a columnar file and build its id index"""
+    columnar = ColumnarHierarchy.load(path)
+    columnar.index_of(columnar.ids[0])
+    return columnar
+
+
+def best_time(function, *args, repeat=3):
+    """Best wall time of `repeat` calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_columnar(args):
+    """Nested JSON vs. the columnar format: file size and parse time"""
+    print(f"{'input':>6}{'format':>10}{'bytes':>15}{'gzip bytes':>13}{'parse + index':>15}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            importer = SimpleOrganigramImporter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer.process_rows(importer.load_csv(path))
+                hierarchy = importer.create_hierarchical_structure()
+
+            nested_path = os.path.join(tmp_dir, 'hierarchy.json')
+            columnar_path = os.path.join(tmp_dir, 'hierarchy.columnar.json')
+            save_hierarchy_json(hierarchy, nested_path)
+            write_columnar(hierarchy, columnar_path)
+            assert len(load_nested(nested_path)) == len(load_columnar(columnar_path))
+
+            for name, file_path, loader in [('nested', nested_path, load_nested),
+                                            ('columnar', columnar_path, load_columnar)]:
+                with open(file_path, 'rb') as f:
+                    compressed = len(gzip.compress(f.read()))
+                elapsed = best_time(loader, file_path)
+                print(f"{label:>6}{name:>10}{os.path.getsize(file_path):>15,}{compressed:>13,}{elapsed * 1000:>12.1f} ms")
+    return 0
+
+
+def bench_store(args):
+    """Nested JSON vs. the mmap store: time to open and to answer node queries"""
+    print(f"{'input':>6}{'source':>8}{'bytes':>15}{'open':>12}{'per query':>12}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            importer = SimpleOrganigramImporter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer.process_rows(importer.load_csv(path))
+                hierarchy = importer.create_hierarchical_structure()
+            query_ids = random.Random(0).sample(importer.model.ids, min(args.queries, len(importer.model)))
+
+            nested_path = os.path.join(tmp_dir, 'hierarchy.json')
+            store_file = os.path.join(tmp_dir, 'hierarchy.orgh')
+            save_hierarchy_json(hierarchy, nested_path)
+            write_store(hierarchy, store_file)
+            del hierarchy, importer
+
+            # A node, its parent chain and its children, answered from the flat id map
+            start = time.perf_counter()
+            flat = load_nested(nested_path)
+            opened = time.perf_counter()
+            for node_id in query_ids:
+                node = flat[node_id]
+                chain = []
+                while node['pid'] in flat:
+                    node = flat[node['pid']]
+                    chain.append(node)
+                children = flat[node_id]['children']
+            queried = time.perf_counter()
+            print(f"{label:>6}{'json':>8}{os.path.getsize(nested_path):>15,}{(opened - start) * 1000:>9.1f} ms"
+                  f"{(queried - opened) / len(query_ids) * 1e6:>9.1f} µs")
+            del flat
+
+            start = time.perf_counter()
+            with HierarchyStore(store_file) as store:
+                opened = time.perf_counter()
+                for node_id in query_ids:
+                    store.node(node_id)
+                    store.parent_chain(node_id)
+                    store.children(node_id)
+                queried = time.perf_counter()
+            print(f"{label:>6}{'store':>8}{os.path.getsize(store_file):>15,}{(opened - start) * 1000:>9.1f} ms"
+                  f"{(queried - opened) / len(query_ids) * 1e6:>9.1f} µs")
+    return 0
+
+
+def csv_nodes(path):
+    """Yield (id, name, pid, level) per CSV row, reading one row at a time"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            pid = row['pid']
+            yield row['id'], row['name'], None if pid in ('', 'NULL') else pid, row['level']
+
+
+def load_dict_nodes(path):
+    """The original storage: a dict per node, children_map and a copied tree"""
+    nodes = {}
+    children_map = defaultdict(list)
+    for node_id, name, pid, level in csv_nodes(path):
+        nodes[node_id] = {'id': node_id, 'name': name, 'pid': pid, 'level': level, 'children': []}
+        if pid is not None:
+            children_map[pid].append(node_id)
+    for parent_id, child_ids in children_map.items():
+        if parent_id in nodes:
+            nodes[parent_id]['children'] = child_ids
+    tree = [legacy_build_tree(node['id'], nodes) for node in nodes.values() if node['pid'] is None]
+    return nodes, children_map, tree
+
+
+def load_model(path):
+    """The shared HierarchyModel, linked and ready to write"""
+    model = HierarchyModel()
+    for node_id, name, pid, level in csv_nodes(path):
+        model.add(node_id, name, pid, level)
+    roots, _ = model.build_hierarchy()
+    return model, roots
+
+
+def bench_model(args):
+    """Memory held by dict-per-node storage vs. the struct-of-arrays model"""
+    factor = math.ceil(args.nodes / sum(1 for _ in csv_nodes(args.csv)))
+    print(f"{'input':>8}{'storage':>10}{'time':>10}{'retained':>13}{'peak':>13}{'per node':>11}")
+    with synthetic_inputs(args.csv, [1, factor]) as inputs:
+        for _, path in inputs:
+            count = sum(1 for _ in csv_nodes(path))
+            for name, loader in [('dicts', load_dict_nodes), ('model', load_model)]:
+                tracemalloc.start()
+                start = time.perf_counter()
+                result = loader(path)
+                elapsed = time.perf_counter() - start
+                retained, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del result
+                print(f"{count:>8,}{name:>10}{elapsed:>9.2f}s{retained / 1024 / 1024:>10.1f} MB"
+                      f"{peak / 1024 / 1024:>10.1f} MB{retained / count:>9.0f} B")
+    return 0
+
+
+# Run in a fresh interpreter per writer so peak RSS belongs to that writer alone
+WRITE_PROBE = """
+import json, os, sys, time
+from benchmark_import import legacy_build_tree
+from hierarchy_builder import build_hierarchy
+from hierarchy_writer import peak_rss_bytes, save_hierarchy_json
+from process_nodes import process_csv
+
+csv_path, output_path, writer = sys.argv[1:4]
+nodes, children_map = process_csv(csv_path)
+loaded = peak_rss_bytes()
+
+start = time.perf_counter()
+if writer == 'json.dump':
+    for parent_id, child_ids in children_map.items():
+        if parent_id in nodes:
+            nodes[parent_id]['children'] = child_ids
+    roots = [legacy_build_tree(node['id'], nodes) for node in nodes.values() if node['pid'] is None]
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(roots, f, indent=2, ensure_ascii=False)
+    written = {'bytes_written': os.path.getsize(output_path)}
+else:
+    roots, _ = build_hierarchy(nodes, children_map)
+    compress = 'gzip' if writer.endswith('gzip') else None
+    written = save_hierarchy_json(roots, output_path, compact=writer.startswith('compact'), compress=compress)
+elapsed = time.perf_counter() - start
+
+print(json.dumps(dict(written, seconds=elapsed, loaded_rss=loaded, peak_rss=peak_rss_bytes())))
+"""
+
+WRITERS = ['json.dump', 'stream', 'compact', 'compact+gzip']
+
+
+def probe_write(csv_path, output_path, writer):
+    """Build and save a hierarchy in a new process, returning its measurements"""
+    output = subprocess.run([sys.executable, '-c', WRITE_PROBE, os.path.abspath(csv_path), output_path, writer], check=True,
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def bench_write(args):
+    """Copy + json.dump vs. the streaming writer: time, output size, peak RSS"""
+    print(f"{'input':>6}{'writer':>14}{'time':>10}{'bytes':>15}{'.gz bytes':>13}{'peak RSS':>12}{'write RSS':>12}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            for writer in WRITERS:
+                result = probe_write(path, os.path.join(tmp_dir, 'hierarchy.json'), writer)
+                compressed = f"{result['compressed_bytes']:>13,}" if 'compressed_bytes' in result else f"{'-':>13}"
+                peak = result['peak_rss'] / 1024 / 1024
+                growth = (result['peak_rss'] - result['loaded_rss']) / 1024 / 1024
+                print(f"{label:>6}{writer:>14}{result['seconds']:>9.2f}s{result['bytes_written']:>15,}"
+                      f"{compressed}{peak:>9.1f} MB{growth:>9.1f} MB")
+    return 0
+
+
+def bench_encoding(args):
+    """Per-encoding retries vs. detect-then-parse on files with a late non-UTF-8 byte"""
+    print(f"{'input':>6}{'loader':>10}{'retry loop':>13}{'detect once':>13}{'detection':>11}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            late_path = os.path.join(tmp_dir, f"{label}_late_latin1.csv")
+            with open(path, 'rb') as source, open(late_path, 'wb') as late:
+                late.write(source.read())
+                late.write('"Caf\xe9 parts","999999999","1","l2"\n'.encode('latin-1'))
+
+            detection, encoding = timed(detect_encoding, late_path)
+            assert encoding == 'latin-1'
+            for name, legacy, current in [('pandas', legacy_load_csv, OrganigramImporter().load_csv),
+                                          ('csv', legacy_load_rows, SimpleOrganigramImporter().load_csv)]:
+                before, _ = timed(legacy, late_path)
+                after, _ = timed(current, late_path)
+                print(f"{label:>6}{name:>10}{before:>12.2f}s{after:>12.2f}s{detection:>10.3f}s")
+    return 0
+
+
+def split_csv(source, parts, tmp_dir):
+    """Deal a catalog's rows round-robin into `parts` CSV files, so most parents live in another file"""
+    with open(source, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    paths = []
+    for part in range(parts):
+        path = os.path.join(tmp_dir, f"{Path(source).stem}_part{part + 1}.csv")
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC)
+            writer.writeheader()
+            writer.writerows(rows[part::parts])
+        paths.append(path)
+    return paths
+
+
+def bench_multi(args):
+    """Multi-file import: files parsed one after another vs. in a process pool"""
+    print(f"{'input':>6}{'files':>7}{'workers':>9}{'parse':>10}{'total':>10}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            paths = split_csv(path, args.files, tmp_dir)
+            output_path = os.path.join(tmp_dir, 'merged.json')
+            for workers in args.workers:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, stats = SimpleOrganigramImporter().import_csv_files(paths, output_path, workers=workers)
+                timings = stats['timings']
+                print(f"{label:>6}{len(paths):>7}{workers:>9}{timings['parse']:>9.2f}s{timings['total']:>9.2f}s")
+    return 0
+
+
+def csv_to_xlsx(source, destination):
+    """Copy a catalog CSV into a single-sheet workbook, with numeric ids as numbers"""
+    import openpyxl
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Nodes')
+    with open(source, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.reader(file):
+            sheet.append([int(value) if value.isdigit() else (None if value == 'NULL' else value) for value in row])
+    workbook.save(destination)
+    return destination
+
+
+# Run in a fresh interpreter per reader so peak RSS belongs to that reader alone
+EXCEL_PROBE = """
+import contextlib, io, json, sys, time
+from hierarchy_writer import peak_rss_bytes
+from import_organigram import OrganigramImporter
+from import_cache import ImportCache
+from incremental_import import changes_path, manifest_path, save_incremental
+
+xlsx_path, reader = sys.argv[1:3]
+importer = OrganigramImporter()
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if reader == 'pandas':
+        importer.process_dataframe(importer.load_excel(xlsx_path))
+    else:
+        importer.process_excel_stream(xlsx_path)
+elapsed = time.perf_counter() - start
+print(json.dumps({'nodes': len(importer.model), 'seconds': elapsed, 'peak_rss': peak_rss_bytes()}))
+"""
+
+
+def bench_excel(args):
+    """pandas read_excel vs. openpyxl read-only streaming: rows/sec and peak RSS"""
+    print(f"{'input':>6}{'rows':>12}{'reader':>10}{'time':>10}{'rows/sec':>12}{'peak RSS':>12}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            xlsx_path = csv_to_xlsx(path, os.path.join(tmp_dir, f"{label}.xlsx"))
+            for reader in ['pandas', 'stream']:
+                output = subprocess.run([sys.executable, '-c', EXCEL_PROBE, xlsx_path, reader], check=True,
+                                        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+                result = json.loads(output.stdout.strip().splitlines()[-1])
+                print(f"{label:>6}{result['nodes']:>12,}{reader:>10}{result['seconds']:>9.2f}s"
+                      f"{result['nodes'] / result['seconds']:>12,.0f}{result['peak_rss'] / 1024 / 1024:>9.1f} MB")
+    return 0
+
+
+def change_csv(source, changes, destination, seed=0):
+    """Copy a catalog CSV with `changes` rows edited: half renamed, half moved to another parent"""
+    with open(source, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    rng = random.Random(seed)
+    picks = rng.sample(range(len(rows)), changes)
+    for count, index in enumerate(picks):
+        if count % 2:
+            rows[index]['pid'] = rows[rng.randrange(len(rows))]['id']
+        else:
+            rows[index]['name'] += ' (revised)'
+
+    with open(destination, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writeheader()
+        writer.writerows(rows)
+    return destination
+
+
+def bench_incremental(args):
+    """Full re-import vs. patching the previous output after a small edit"""
+    print(f"{'input':>6}{'nodes':>11}{'changed':>9}{'full import':>13}{'incremental':>13}"
+          f"{'full write':>12}{'patch':>9}{'rewritten':>11}{'copied':>8}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        for label, path in inputs:
+            changed_path = change_csv(path, args.changes, os.path.join(tmp_dir, f"{label}_changed.csv"))
+            previous = os.path.join(tmp_dir, f"{label}_previous.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                SimpleOrganigramImporter().import_csv(path, previous, incremental=True)
+
+            def restore_previous(output_path):
+                shutil.copyfile(previous, output_path)
+                shutil.copyfile(manifest_path(previous), manifest_path(output_path))
+                return output_path
+
+            full_path = os.path.join(tmp_dir, f"{label}_full.json")
+            full_import, _ = timed(SimpleOrganigramImporter().import_csv, changed_path, full_path)
+            patched_path = restore_previous(os.path.join(tmp_dir, f"{label}_patched.json"))
+            incremental_import, _ = timed(SimpleOrganigramImporter().import_csv, changed_path, patched_path,
+                                          False, None, False, False, True)
+            with open(full_path, 'rb') as full, open(patched_path, 'rb') as patched:
+                assert full.read() == patched.read(), "patched output differs from a full import"
+
+            # The write step alone, on one loaded model
+            importer = SimpleOrganigramImporter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer.process_rows(importer.load_csv(changed_path))
+                hierarchy = importer.create_hierarchical_structure()
+            full_write, _ = timed(save_hierarchy_json, hierarchy, full_path)
+            restore_previous(patched_path)
+            patch, result = timed(save_incremental, importer.model, hierarchy, patched_path)
+            with open(changes_path(patched_path), 'r', encoding='utf-8') as f:
+                counts = json.load(f)['counts']
+            print(f"{label:>6}{len(importer.model):>11,}{sum(counts.values()):>9}{full_import:>12.2f}s"
+                  f"{incremental_import:>12.2f}s{full_write:>11.3f}s{patch:>8.3f}s"
+                  f"{result['rewritten']:>11,}{result['copied']:>8,}")
+    return 0
+
+
+def bench_cache(args):
+    """Uncached import vs. re-importing an unchanged file through the import cache"""
+    print(f"{'input':>6}{'nodes':>11}{'no cache':>11}{'first run':>11}{'cache hit':>11}{'speedup':>9}")
+    with synthetic_inputs(args.csv, args.factors) as inputs, tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ImportCache(os.path.join(tmp_dir, 'cache'))
+        for label, path in inputs:
+            output_path = os.path.join(tmp_dir, f"{label}.json")
+            # JSON plus columnar and store outputs, without and with the cache
+            options = (False, None, True, True, False)
+            uncached, (_, stats) = timed(SimpleOrganigramImporter().import_csv, path, output_path, *options)
+            first, _ = timed(SimpleOrganigramImporter().import_csv, path, output_path, *options, cache)
+            hit, _ = timed(SimpleOrganigramImporter().import_csv, path, output_path, *options, cache)
+            print(f"{label:>6}{stats['total_nodes']:>11,}{uncached:>10.2f}s{first:>10.2f}s"
+                  f"{hit * 1000:>8.1f} ms{uncached / hit:>8.0f}x")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the organigram importers")
+    parser.add_argument('--csv', default='nodes.csv', help='Catalog CSV to expand (default: nodes.csv)')
+    parser.add_argument('--factors', type=int, nargs='+', default=[1, 10, 100],
+                        help='Synthetic expansion factors of the catalog')
+
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    csv_parser = subparsers.add_parser('csv', help='iterrows vs. vectorized vs. streaming CSV processing')
+    csv_parser.add_argument('--legacy-limit', type=int, default=200000,
+                            help='Skip the iterrows path above this many rows')
+
+    tree_parser = subparsers.add_parser('tree', help='Recursive vs. iterative hierarchy building on synthetic trees')
+    tree_parser.add_argument('--deep', type=int, default=10000, help='Levels in the chain-shaped tree')
+    tree_parser.add_argument('--wide', type=int, default=100000, help='Siblings under the single root')
+
+    subparsers.add_parser('write', help='Copy + json.dump vs. streaming JSON writer (time, size, peak RSS)')
+
+    subparsers.add_parser('columnar', help='Nested JSON vs. flat columnar format (size, parse time)')
+    store_parser = subparsers.add_parser('store', help='Nested JSON vs. mmap hierarchy store (open time, query latency)')
+    store_parser.add_argument('--queries', type=int, default=1000, help='Random node ids to look up')
+    model_parser = subparsers.add_parser('model', help='Memory of dict-per-node storage vs. the shared node model')
+    model_parser.add_argument('--nodes', type=int, default=1000000, help='Approximate size of the synthetic file')
+    multi_parser = subparsers.add_parser('multi', help='Multi-file import with 1 vs. several worker processes')
+    multi_parser.add_argument('--files', type=int, default=4, help='Files to split each input into')
+    multi_parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help='Worker counts to compare')
+    subparsers.add_parser('encoding', help='Per-encoding retries vs. single-pass encoding detection')
+    subparsers.add_parser('excel', help='pandas read_excel vs. streaming openpyxl read-only ingestion')
+    incremental_parser = subparsers.add_parser('incremental', help='Full re-import vs. incremental patch after a small edit')
+    incremental_parser.add_argument('--changes', type=int, default=10, help='Rows to edit between the two imports')
+    subparsers.add_parser('cache', help='Uncached import vs. cache hit for an unchanged input')
+
+    args = parser.parse_args()
+    benchmarks = {
+        'csv': bench_csv,
+        'tree': bench_tree,
+        'write': bench_write,
+        'columnar': bench_columnar,
+        'store': bench_store,
+        'model': bench_model,
+        'multi': bench_multi,
+        'encoding': bench_encoding,
+        'excel': bench_excel,
+        'incremental': bench_incremental,
+        'cache': bench_cache,
+    }
+    sys.exit(benchmarks[args.benchmark](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Intelligent Label Normalization Service
+Measures label throughput on real catalog names (nodes.csv by default)
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from normalization_service import (TERMS_DIR, WORD_RE, WORD_SPLIT_RE, CompoundTermMatcher, IntelligentNormalizer,
+                                   ParallelNormalizer, TermSnapshot, load_term_domains)
+
+
+class LegacyNormalizer(IntelligentNormalizer):
+    """Reference copy of the original per-pattern implementation.
+
+    Kept here so the engine benchmark can compare throughput and verify that
+    the compiled engine still produces byte-for-byte identical output.
+    """
+
+    def is_technical_term(self, word):
+        if word.upper() in self.technical_terms:
+            return True
+        for pattern in self.technical_patterns:
+            if re.match(pattern, word):
+                return True
+        return False
+
+    def is_real_word(self, word):
+        clean_word = re.sub(r'[^a-zA-Z]', '', word.lower())
+        if len(clean_word) < 2:
+            return False
+        return clean_word in self.spell
+
+    def should_preserve_case(self, word):
+        for pattern in self.preserve_patterns:
+            if re.match(pattern, word):
+                return True
+        if word.isupper() and self.is_technical_term(word):
+            return True
+        if word.isupper() and not self.is_real_word(word):
+            return True
+        if word.upper() in self.technical_terms:
+            return True
+        return False
+
+    def normalize_word(self, word):
+        if len(word) < 2:
+            return word
+        if word.upper() in self.technical_terms:
+            return word.upper()
+        if self.should_preserve_case(word):
+            return word
+        return word.lower().capitalize()
+
+    def normalize_text(self, text):
+        if not text or not isinstance(text, str):
+            return text
+        tokens = re.findall(r'\b\w+\b|\s+|[^\w\s]', text)
+        normalized_tokens = []
+        for token in tokens:
+            if re.match(r'\b\w+\b', token):
+                normalized_tokens.append(self.normalize_word(token))
+            else:
+                normalized_tokens.append(token)
+        return ''.join(normalized_tokens)
+
+    def analyze_text(self, text):
+        if not text or not isinstance(text, str):
+            return {
+                'original': text,
+                'normalized': text,
+                'changed': False,
+                'preserved_terms': [],
+                'normalized_words': []
+            }
+        normalized = self.normalize_text(text)
+        words = re.findall(r'\b\w+\b', text)
+        preserved_terms = [word for word in words if self.should_preserve_case(word)]
+        original_words = re.findall(r'\b\w+\b', text)
+        normalized_words = re.findall(r'\b\w+\b', normalized)
+        changed_words = []
+        for i, (orig, norm) in enumerate(zip(original_words, normalized_words)):
+            if orig != norm:
+                changed_words.append({'original': orig, 'normalized': norm, 'position': i})
+        return {
+            'original': text,
+            'normalized': normalized,
+            'changed': text != normalized,
+            'preserved_terms': preserved_terms,
+            'normalized_words': changed_words
+        }
+
+
+class PerTokenNormalizer(IntelligentNormalizer):
+    """The engine without the compound term matcher: every word is looked up on its own"""
+
+    # Shadows the snapshot's matcher with one built from no terms, which never matches
+    compound_matcher = CompoundTermMatcher(())
+
+
+def load_labels(csv_path, column='name'):
+    """Read one column of labels from a catalog CSV"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        return [row[column] for row in csv.DictReader(file) if row.get(column)]
+
+
+def time_labels(normalizer, labels, repeat):
+    """Return the best labels/sec over `repeat` full passes"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for label in labels:
+            normalizer.analyze_text(label)
+        best = min(best, time.perf_counter() - start)
+    return len(labels) / best
+
+
+def bench_engine(args):
+    """Compare the compiled engine against the legacy per-pattern path"""
+    labels = load_labels(args.csv, args.column)
+    legacy = LegacyNormalizer()
+    engine = IntelligentNormalizer()
+
+    print(f"🔍 Verifying output on {len(labels):,} labels...")
+    mismatches = [label for label in labels if legacy.analyze_text(label) != engine.analyze_text(label)]
+    if mismatches:
+        print(f"❌ {len(mismatches)} labels differ, e.g. {mismatches[0]!r}")
+        return 1
+    print("✅ Outputs are identical")
+
+    before = time_labels(legacy, labels, args.repeat)
+    after = time_labels(engine, labels, args.repeat)
+    print(f"Legacy engine:   {before:>10,.0f} labels/sec")
+    print(f"Compiled engine: {after:>10,.0f} labels/sec")
+    print(f"Speedup:         {after / before:>10.2f}x")
+    return 0
+
+
+def bench_cache(args):
+    """Compare throughput with the word-decision cache disabled and enabled"""
+    labels = load_labels(args.csv, args.column)
+    uncached = IntelligentNormalizer(cache_size=0)
+    cached = IntelligentNormalizer(cache_size=args.cache_size)
+
+    before = time_labels(uncached, labels, args.repeat)
+    after = time_labels(cached, labels, args.repeat)
+    stats = cached.word_cache.stats()
+    print(f"Labels: {len(labels):,}")
+    print(f"No cache:         {before:>10,.0f} labels/sec")
+    print(f"LRU cache ({args.cache_size:,}): {after:>10,.0f} labels/sec")
+    print(f"Speedup:          {after / before:>10.2f}x")
+    print(f"Cache: {stats['size']:,} entries, {stats['hits']:,} hits, "
+          f"{stats['misses']:,} misses, {stats['evictions']:,} evictions "
+          f"(hit rate {stats['hit_rate']:.1%})")
+    return 0
+
+
+def bench_parallel(args):
+    """Report batch throughput and speedup for increasing worker counts"""
+    labels = load_labels(args.csv, args.column) * args.scale
+    print(f"Labels per batch: {len(labels):,}")
+
+    baseline = None
+    for workers in args.workers:
+        batch = ParallelNormalizer(IntelligentNormalizer(), workers=workers, threshold=0)
+        try:
+            expected = batch.analyze_batch(labels)  # warm-up pass starts the pool
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = batch.analyze_batch(labels)
+                best = min(best, time.perf_counter() - start)
+            assert results == expected
+        finally:
+            batch.close()
+
+        rate = len(labels) / best
+        baseline = baseline or rate
+        print(f"{workers:>2} worker(s): {rate:>10,.0f} labels/sec  ({rate / baseline:.2f}x)")
+    return 0
+
+
+def time_batch(normalizer, labels, repeat, batched):
+    """Return the best seconds per batch, starting each pass with an empty word cache"""
+    best = float('inf')
+    for _ in range(repeat):
+        normalizer.word_cache.clear()
+        start = time.perf_counter()
+        if batched:
+            normalizer.analyze_batch(labels)
+        else:
+            for label in labels:
+                normalizer.analyze_text(label)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_tokens(args):
+    """Per-batch time of per-label vs. batch-deduplicated analysis, by unique token count"""
+    catalog = list(dict.fromkeys(load_labels(args.csv, args.column)))
+    size = args.batch_size or len(catalog)
+    normalizer = IntelligentNormalizer()
+    normalizer.warm_up()
+
+    print(f"Labels per batch: {size:,}")
+    print(f"{'Distinct labels':>15}{'Tokens':>10}{'Unique':>10}{'Per label':>12}{'Batch':>10}{'Speedup':>10}")
+    for share in args.shares:
+        # Cycle through the first share% of distinct labels to fill the batch
+        distinct = catalog[:max(1, len(catalog) * share // 100)]
+        labels = (distinct * -(-size // len(distinct)))[:size]
+        words = [word for label in labels for word in WORD_RE.findall(label)]
+
+        if normalizer.analyze_batch(labels) != [normalizer.analyze_text(label) for label in labels]:
+            print(f"❌ Batch results differ from per-label results at {share}%")
+            return 1
+        per_label = time_batch(normalizer, labels, args.repeat, batched=False)
+        batched = time_batch(normalizer, labels, args.repeat, batched=True)
+        print(f"{len(distinct):>15,}{len(words):>10,}{len(set(words)):>10,}"
+              f"{per_label * 1000:>10.1f}ms{batched * 1000:>8.1f}ms{per_label / batched:>9.2f}x")
+    return 0
+
+
+def bench_compounds(args):
+    """Compound term matcher vs. the per-token path on catalog labels"""
+    labels = load_labels(args.csv, args.column)
+    if args.lowercase:
+        labels += [label.lower() for label in labels]
+    per_token = PerTokenNormalizer()
+    matcher = IntelligentNormalizer()
+
+    matched = 0
+    differing = []
+    for label in labels:
+        if matcher.compound_matcher.find(label, WORD_SPLIT_RE.split(label)):
+            matched += 1
+        result = matcher.analyze_text(label)
+        if result != per_token.analyze_text(label):
+            differing.append((label, result['normalized']))
+    print(f"Labels: {len(labels):,}, with a compound term: {matched:,}, normalized differently: {len(differing):,}")
+    for label, normalized in differing[:5]:
+        print(f"  {label!r} → {normalized!r}")
+
+    before = time_labels(per_token, labels, args.repeat)
+    after = time_labels(matcher, labels, args.repeat)
+    print(f"Per-token path:   {before:>10,.0f} labels/sec")
+    print(f"Compound matcher: {after:>10,.0f} labels/sec")
+    print(f"Ratio:            {after / before:>10.2f}x")
+    return 0
+
+
+def bench_reload(args):
+    """Term snapshot compile and swap cost, and analysis while snapshots are swapped"""
+    labels = load_labels(args.csv, args.column)
+    domains = load_term_domains(TERMS_DIR)
+    edited = dict(domains)
+    version, terms = edited[args.domain]
+    edited[args.domain] = (version + 1, terms | set(args.add))
+
+    start = time.perf_counter()
+    snapshots = [TermSnapshot(domains), TermSnapshot(edited)]
+    compile_time = (time.perf_counter() - start) / 2
+
+    normalizer = IntelligentNormalizer()
+    normalizer.analyze_batch(labels)
+    warm_entries = normalizer.word_cache.stats()['size']
+    start = time.perf_counter()
+    changed_terms, invalidated = normalizer.swap_snapshot(snapshots[1])
+    swap_time = time.perf_counter() - start
+
+    selective = normalizer.analyze_batch(labels)
+    normalizer.word_cache.clear()
+    if selective != normalizer.analyze_batch(labels):
+        print("❌ Results after the selective invalidation differ from a cold cache")
+        return 1
+
+    # Swap back and forth while another thread keeps analyzing the catalog
+    errors = []
+    passes = 0
+    stop = threading.Event()
+
+    def analyze():
+        nonlocal passes
+        while not stop.is_set():
+            try:
+                normalizer.analyze_batch(labels)
+                passes += 1
+            except Exception as e:
+                errors.append(e)
+
+    worker = threading.Thread(target=analyze)
+    worker.start()
+    for swap in range(args.swaps):
+        normalizer.swap_snapshot(snapshots[swap % 2])
+        time.sleep(0.01)
+    stop.set()
+    worker.join()
+    reference = IntelligentNormalizer()
+    reference.swap_snapshot(normalizer.snapshot)
+    if normalizer.analyze_batch(labels) != reference.analyze_batch(labels):
+        print("❌ Cached decisions are stale after concurrent swaps")
+        return 1
+
+    print(f"Terms: {len(snapshots[1].terms):,} in {len(domains)} domains, "
+          f"adding {', '.join(args.add)} to '{args.domain}'")
+    print(f"Compile snapshot:  {compile_time * 1000:>8.2f}ms")
+    print(f"Swap + invalidate: {swap_time * 1000:>8.2f}ms "
+          f"({invalidated:,} of {warm_entries:,} cached words dropped)")
+    print(f"Concurrent swaps: {args.swaps}, catalog passes meanwhile: {passes}, failed: {len(errors)}")
+    return 1 if errors else 0
+
+
+# Run in a fresh interpreter so every measurement is a true cold start
+STARTUP_PROBE = """
+import json, time
+start = time.perf_counter()
+import normalization_service
+imported = time.perf_counter()
+client = normalization_service.app.test_client()
+# Mixed letter/digit acronyms like TYPE2A are the words that reach the dictionary
+client.post('/normalize-text', json={'text': 'TYPE2A cmos sensor'})
+first = time.perf_counter()
+client.post('/normalize-text', json={'text': 'MAX2X LED light'})
+second = time.perf_counter()
+print(json.dumps({'import': imported - start, 'first': first - imported, 'second': second - first}))
+"""
+
+
+def probe_startup(dictionary_cache):
+    """Import the service in a new process and time the first requests"""
+    env = dict(os.environ, NORMALIZER_DICTIONARY_CACHE=dictionary_cache)
+    output = subprocess.run([sys.executable, '-c', STARTUP_PROBE], env=env, check=True,
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+# A fresh service process normalizes the whole catalog once, as after a deploy
+RESTART_PROBE = """
+import csv, json, sys, time
+start = time.perf_counter()
+import normalization_service
+imported = time.perf_counter()
+with open(sys.argv[1], 'r', encoding='utf-8', newline='') as file:
+    labels = [row[sys.argv[2]] for row in csv.DictReader(file) if row.get(sys.argv[2])]
+begin = time.perf_counter()
+normalization_service.batch_normalizer.analyze_batch(labels)
+finished = time.perf_counter()
+store = normalization_service.result_store
+if store is not None:
+    store.flush()
+print(json.dumps({'import': imported - start, 'pass': finished - begin, 'flush': time.perf_counter() - finished,
+                  'dictionary': normalization_service.normalizer._dictionary_words is not None,
+                  'store': store.stats() if store is not None else None}))
+"""
+
+
+def probe_restart(csv_path, column, store_path=None):
+    """Start the service in a new process and time its first full-catalog pass"""
+    env = dict(os.environ)
+    env.pop('NORMALIZER_RESULT_STORE', None)
+    if store_path:
+        env['NORMALIZER_RESULT_STORE'] = store_path
+    output = subprocess.run([sys.executable, '-c', RESTART_PROBE, os.path.abspath(csv_path), column], env=env,
+                            check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def bench_restart(args):
+    """First full-catalog pass after a cold restart, with and without the result store"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store_path = os.path.join(tmp_dir, 'results.sqlite')
+        runs = [('No result store', probe_restart(args.csv, args.column)) for _ in range(args.repeat)]
+        runs.append(('Empty store', probe_restart(args.csv, args.column, store_path)))
+        runs += [('Restart, filled store', probe_restart(args.csv, args.column, store_path))
+                 for _ in range(args.repeat)]
+        store_size = os.path.getsize(store_path)
+
+    print(f"{'Start':<24}{'import':>10}{'1st pass':>12}{'flush':>10}{'hit rate':>10}  dictionary")
+    for name, timing in runs:
+        hit_rate = f"{timing['store']['hit_rate']:.0%}" if timing['store'] else '-'
+        print(f"{name:<24}{timing['import'] * 1000:>8.1f}ms{timing['pass'] * 1000:>10.1f}ms"
+              f"{timing['flush'] * 1000:>8.1f}ms{hit_rate:>10}  {'loaded' if timing['dictionary'] else 'not needed'}")
+    print(f"Store file: {store_size / 1024 / 1024:.1f} MB")
+    return 0
+
+
+def bench_startup(args):
+    """Cold-start import time and first-request latency"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dictionary_cache = os.path.join(tmp_dir, 'spell_words_en.txt')
+        runs = [('No dictionary cache', probe_startup(dictionary_cache))]
+        runs += [('Dictionary cache', probe_startup(dictionary_cache)) for _ in range(args.repeat)]
+
+    print(f"{'Start':<22}{'import':>10}{'1st request':>14}{'2nd request':>14}")
+    for name, timing in runs:
+        print(f"{name:<22}{timing['import'] * 1000:>8.1f}ms"
+              f"{timing['first'] * 1000:>12.1f}ms{timing['second'] * 1000:>12.1f}ms")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the label normalization service")
+    parser.add_argument('--csv', default='nodes.csv', help='Catalog CSV to read labels from (default: nodes.csv)')
+    parser.add_argument('--column', default='name', help='Column holding the labels (default: name)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per measurement, best is reported')
+
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    subparsers.add_parser('engine', help='Compiled classification engine vs. legacy per-pattern matching')
+    cache_parser = subparsers.add_parser('cache', help='Word-decision LRU cache on vs. off')
+    cache_parser.add_argument('--cache-size', type=int, default=50000, help='LRU capacity to benchmark')
+
+    parallel_parser = subparsers.add_parser('parallel', help='Process-pool batch normalization vs. worker count')
+    parallel_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                                 help='Worker counts to compare (1 = in-process)')
+    parallel_parser.add_argument('--scale', type=int, default=1,
+                                 help='Repeat the label list this many times per batch')
+
+    subparsers.add_parser('startup', help='Cold-start import time and first-request latency')
+
+    tokens_parser = subparsers.add_parser('tokens', help='Batch token deduplication vs. per-label analysis')
+    tokens_parser.add_argument('--batch-size', type=int, default=0,
+                               help='Labels per batch (default: every distinct label in the CSV)')
+    tokens_parser.add_argument('--shares', type=int, nargs='+', default=[1, 5, 25, 100],
+                               help='Percentages of the distinct labels each batch cycles through')
+
+    compounds_parser = subparsers.add_parser('compounds', help='Compound term matcher vs. per-token lookups')
+    compounds_parser.add_argument('--lowercase', action='store_true',
+                                  help='Also run a lower-cased copy of every label')
+
+    reload_parser = subparsers.add_parser('reload', help='Term dictionary hot reload: compile, swap, invalidation')
+    reload_parser.add_argument('--domain', default='automotive', help='Dictionary to add terms to')
+    reload_parser.add_argument('--add', nargs='+', default=['CONTROL', 'UNIT'], help='Terms to add')
+    reload_parser.add_argument('--swaps', type=int, default=50, help='Swaps made while a thread keeps analyzing')
+
+    subparsers.add_parser('restart', help='Cold restart and full-catalog pass with the persistent result store')
+
+    args = parser.parse_args()
+    benchmarks = {
+        'engine': bench_engine,
+        'cache': bench_cache,
+        'parallel': bench_parallel,
+        'startup': bench_startup,
+        'tokens': bench_tokens,
+        'compounds': bench_compounds,
+        'reload': bench_reload,
+        'restart': bench_restart,
+    }
+    sys.exit(benchmarks[args.benchmark](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Encoding detection for the organigram import tools
+Picks a CSV file's encoding once, so the file is parsed in a single pass
+instead of once per candidate encoding
+"""
+
+import codecs
+
+# Tried in order; the first that decodes the whole file strictly wins
+CSV_ENCODINGS = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+
+SAMPLE_SIZE = 64 * 1024
+PROBE_BLOCK_SIZE = 1024 * 1024
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def decodes(file, encoding):
+    """Whether the rest of a binary file decodes strictly, without keeping the text"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    try:
+        for block in iter(lambda: file.read(PROBE_BLOCK_SIZE), b''):
+            decoder.decode(block)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def detect_encoding(file_path, encodings=CSV_ENCODINGS, sample_size=SAMPLE_SIZE):
+    """Return the encoding to read file_path with
+
+    A byte-order mark decides straight away. Otherwise a bounded sample from
+    the start rules out candidates that fail early, and the first remaining
+    candidate that strictly decodes the whole file is chosen. Decoding
+    without parsing is cheap, so a bad byte near the end costs one fast scan
+    rather than a full re-parse.
+    """
+    with open(file_path, 'rb') as file:
+        sample = file.read(sample_size)
+        for bom, encoding in BOMS:
+            if sample.startswith(bom):
+                return encoding
+
+        for encoding in encodings:
+            # The sample may end mid-character, so it is decoded as a non-final block
+            try:
+                codecs.getincrementaldecoder(encoding)(errors='strict').decode(sample)
+            except UnicodeDecodeError:
+                continue
+            file.seek(0)
+            if decodes(file, encoding):
+                return encoding
+
+    raise ValueError("Could not read CSV file with any supported encoding")
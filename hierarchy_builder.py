@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Shared hierarchy builder for the organigram import tools
+Links a flat node index into the nested structure written to JSON, without
+recursion and without copying node dicts
+"""
+
+
+def build_hierarchy(nodes, children_map):
+    """Link nodes into a nested hierarchy in a single iterative pass
+
+    `nodes` maps node id -> node dict (with 'pid' and 'children' keys) and
+    `children_map` maps parent id -> list of child ids, in output order.
+    Each reachable node's 'children' is replaced in place by the list of its
+    child node dicts, so the returned root nodes share the dicts in `nodes`.
+    The id lists in `children_map` are left untouched, so it can be rebuilt.
+
+    Returns (root_nodes, report) where report lists the ids of nodes not
+    reachable from any root, the parent cycles among them (a self-parented
+    node is a cycle of one) and ids listed under more than one parent, which
+    are only linked under the first one reached.
+    """
+    root_nodes = [node for node in nodes.values() if node['pid'] is None]
+    reached = {node['id'] for node in root_nodes}
+    duplicates = []
+
+    stack = list(root_nodes)
+    while stack:
+        node = stack.pop()
+        linked = []
+        for child_id in children_map.get(node['id'], ()):
+            child = nodes.get(child_id)
+            if child is None:
+                continue
+            if child_id in reached:
+                duplicates.append(child_id)
+                continue
+            reached.add(child_id)
+            linked.append(child)
+            stack.append(child)
+        node['children'] = linked
+
+    unreachable = [node_id for node_id in nodes if node_id not in reached]
+    report = {
+        'unreachable': unreachable,
+        'cycles': find_parent_cycles(nodes, unreachable),
+        'duplicates': duplicates
+    }
+    return root_nodes, report
+
+
+def find_parent_cycles(nodes, node_ids):
+    """Return each cycle in the parent chains starting at node_ids
+
+    Every node has a single parent, so following 'pid' from a node either
+    ends (at a root or a missing parent) or loops. Each chain is walked once.
+    """
+    walked = {}
+    cycles = []
+
+    for start in node_ids:
+        if start in walked:
+            continue
+        path = []
+        node_id = start
+        while node_id in nodes and node_id not in walked:
+            walked[node_id] = start
+            path.append(node_id)
+            node_id = nodes[node_id]['pid']
+        # Looping back onto this walk's own path closes a cycle
+        if walked.get(node_id) == start:
+            cycles.append(path[path.index(node_id):])
+
+    return cycles
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Flat columnar format for organigram hierarchies
+Stores the hierarchy as parallel arrays instead of nested node objects, so it
+is much smaller than the nested JSON and is parsed as a handful of lists
+"""
+
+import argparse
+import json
+import os
+import sys
+
+COLUMNAR_FORMAT = 'organigram-columnar'
+COLUMNAR_VERSION = 1
+
+
+def columnar_from_hierarchy(root_nodes):
+    """Flatten a nested hierarchy into the columnar layout
+
+    Nodes are numbered breadth-first, so the children of every node occupy a
+    contiguous index range: node i's children are the nodes numbered
+    child_offsets[i] up to (not including) child_offsets[i + 1], and the roots
+    are nodes 0 .. roots - 1. Parents are stored as indexes (-1 for roots),
+    levels and names as codes into deduplicated string tables.
+    """
+    ids = []
+    parents = []
+    level_codes = []
+    name_codes = []
+    child_offsets = [len(root_nodes)]
+    levels = {}
+    names = {}
+
+    queue = list(root_nodes)
+    queue_parents = [-1] * len(root_nodes)
+    for index, node in enumerate(queue):
+        ids.append(node['id'])
+        parents.append(queue_parents[index])
+        level_codes.append(levels.setdefault(node['level'], len(levels)))
+        name_codes.append(names.setdefault(node['name'], len(names)))
+
+        children = node.get('children') or ()
+        queue.extend(children)
+        queue_parents.extend([index] * len(children))
+        child_offsets.append(len(queue))
+
+    return {
+        'format': COLUMNAR_FORMAT,
+        'version': COLUMNAR_VERSION,
+        'roots': len(root_nodes),
+        'ids': ids,
+        'parents': parents,
+        'levels': list(levels),
+        'level_codes': level_codes,
+        'names': list(names),
+        'name_codes': name_codes,
+        'child_offsets': child_offsets,
+    }
+
+
+def write_columnar(root_nodes, output_path):
+    """Write a hierarchy in the columnar format, returning the bytes written"""
+    data = columnar_from_hierarchy(root_nodes)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return os.path.getsize(output_path)
+
+
+def columnar_path(output_path):
+    """Path of the columnar file written next to a nested JSON output"""
+    output_path = str(output_path)
+    stem = output_path[:-5] if output_path.endswith('.json') else output_path
+    return f"{stem}.columnar.json"
+
+
+class ColumnarHierarchy:
+    """Read-only access to a hierarchy stored in the columnar format"""
+
+    def __init__(self, data):
+        if data.get('format') != COLUMNAR_FORMAT or data.get('version') != COLUMNAR_VERSION:
+            raise ValueError(f"Not a {COLUMNAR_FORMAT} v{COLUMNAR_VERSION} file")
+        self.ids = data['ids']
+        self.parents = data['parents']
+        self.levels = data['levels']
+        self.level_codes = data['level_codes']
+        self.names = data['names']
+        self.name_codes = data['name_codes']
+        self.child_offsets = data['child_offsets']
+        self.root_count = data['roots']
+        self._index = None
+
+    @classmethod
+    def load(cls, path):
+        """Load a columnar hierarchy file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, node_id):
+        """Index of the node with the given id (KeyError if absent)"""
+        if self._index is None:
+            self._index = {node_id: index for index, node_id in enumerate(self.ids)}
+        return self._index[node_id]
+
+    def roots(self):
+        """Indexes of the root nodes"""
+        return range(self.root_count)
+
+    def children(self, index):
+        """Indexes of a node's children, in output order"""
+        return range(self.child_offsets[index], self.child_offsets[index + 1])
+
+    def parent(self, index):
+        """Index of a node's parent, or None for a root"""
+        parent = self.parents[index]
+        return None if parent < 0 else parent
+
+    def node(self, index):
+        """The node at index as an {id, name, pid, level} dict"""
+        parent = self.parents[index]
+        return {
+            'id': self.ids[index],
+            'name': self.names[self.name_codes[index]],
+            'pid': None if parent < 0 else self.ids[parent],
+            'level': self.levels[self.level_codes[index]],
+        }
+
+    def to_nested(self):
+        """Rebuild the nested structure written to nodes_hierarchy.json"""
+        nodes = [self.node(index) for index in range(len(self.ids))]
+        for index, node in enumerate(nodes):
+            node['children'] = nodes[self.child_offsets[index]:self.child_offsets[index + 1]]
+        return nodes[:self.root_count]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a nested hierarchy JSON file to the flat columnar format",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 hierarchy_columnar.py nodes_hierarchy.json
+  python3 hierarchy_columnar.py nodes_hierarchy.json -o nodes.columnar.json
+        """
+    )
+    parser.add_argument('input_file', help='Nested hierarchy JSON (e.g. nodes_hierarchy.json)')
+    parser.add_argument('-o', '--output', help='Output path (default: <input>.columnar.json)')
+
+    args = parser.parse_args()
+    output_path = args.output or columnar_path(args.input_file)
+
+    try:
+        with open(args.input_file, 'r', encoding='utf-8') as f:
+            hierarchy = json.load(f)
+        file_size = write_columnar(hierarchy, output_path)
+        print(f"✅ Columnar file saved: {output_path} ({file_size:,} bytes, "
+              f"{os.path.getsize(args.input_file):,} bytes nested)")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
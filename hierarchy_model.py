@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact node model shared by the organigram importers
+Stores nodes as parallel arrays (struct-of-arrays) instead of one dict per
+node, with interned ids and levels and children kept as index ranges
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+
+from hierarchy_builder import find_parent_cycles
+
+NODE_KEYS = ('id', 'name', 'pid', 'level', 'children')
+
+
+class HierarchyModel:
+    """Nodes in insertion order, linked by index once link() has run
+
+    Node i is ids[i], names[i], pids[i] and levels[level_codes[i]]. Ids and
+    parent ids are interned, so a parent id shares the parent's id string.
+    After link(), parents[i] is the parent's index (-1 if the node has none
+    in the model) and node i's children are
+    child_index[child_offsets[i]:child_offsets[i + 1]], in insertion order.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.pids = []
+        self.levels = []
+        self.level_codes = array('H')
+        self.index = {}
+        self.duplicates = []
+        self._level_codes = {}
+        self.parents = None
+        self.child_offsets = None
+        self.child_index = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node_id):
+        return node_id in self.index
+
+    def add(self, node_id, name, pid, level):
+        """Add a node; a repeated id replaces the earlier node's fields in place"""
+        node_id = sys.intern(node_id)
+        if pid is not None:
+            pid = sys.intern(pid)
+        level_code = self._level_codes.get(level)
+        if level_code is None:
+            level_code = self._level_codes[level] = len(self.levels)
+            self.levels.append(level)
+
+        index = self.index.get(node_id)
+        if index is None:
+            self.index[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            self.names.append(name)
+            self.pids.append(pid)
+            self.level_codes.append(level_code)
+        else:
+            self.duplicates.append(node_id)
+            self.names[index] = name
+            self.pids[index] = pid
+            self.level_codes[index] = level_code
+        self.parents = None
+
+    def merge(self, other):
+        """Append another model's nodes, returning the ids this model already had
+
+        Conflicting ids keep their existing node. Parent ids are left as
+        written, so link() can resolve them against nodes from either model.
+        """
+        conflicts = []
+        for index, node_id in enumerate(other.ids):
+            if node_id in self.index:
+                conflicts.append(node_id)
+            else:
+                self.add(node_id, other.names[index], other.pids[index], other.level(index))
+        self.duplicates.extend(other.duplicates)
+        return conflicts
+
+    def link(self):
+        """Resolve parent ids to indexes and group children into index ranges"""
+        count = len(self.ids)
+        parents = array('i', [-1]) * count
+        child_counts = array('I', [0]) * (count + 1)
+        index = self.index
+        for position, pid in enumerate(self.pids):
+            if pid is not None:
+                parent = index.get(pid, -1)
+                if parent >= 0:
+                    parents[position] = parent
+                    child_counts[parent + 1] += 1
+
+        # Prefix sums give each parent's range; children fill it in insertion order
+        for position in range(count):
+            child_counts[position + 1] += child_counts[position]
+        child_index = array('I', [0]) * child_counts[count]
+        next_slot = array('I', child_counts)
+        for position, parent in enumerate(parents):
+            if parent >= 0:
+                child_index[next_slot[parent]] = position
+                next_slot[parent] += 1
+
+        self.parents = parents
+        self.child_offsets = child_counts
+        self.child_index = child_index
+
+    def children_of(self, index):
+        """Indexes of node index's children"""
+        if self.parents is None:
+            self.link()
+        return self.child_index[self.child_offsets[index]:self.child_offsets[index + 1]]
+
+    def child_count(self, index):
+        """Number of children of node index"""
+        if self.parents is None:
+            self.link()
+        return self.child_offsets[index + 1] - self.child_offsets[index]
+
+    def level(self, index):
+        """Level string of node index"""
+        return self.levels[self.level_codes[index]]
+
+    def node(self, index):
+        """A read-only dict-like view of node index"""
+        return NodeView(self, index)
+
+    def build_hierarchy(self):
+        """Return (root_nodes, report) like hierarchy_builder.build_hierarchy
+
+        Root nodes (those without a parent id) are NodeViews whose 'children'
+        are views too, created on access, so writing the hierarchy never
+        materializes a dict per node. Each node has a single parent, so no
+        node is ever listed twice; report['duplicates'] instead lists ids that
+        appeared on more than one row (the last row wins).
+        """
+        if self.parents is None:
+            self.link()
+        roots = [index for index, pid in enumerate(self.pids) if pid is None]
+
+        reached = bytearray(len(self.ids))
+        stack = list(roots)
+        while stack:
+            index = stack.pop()
+            reached[index] = 1
+            stack.extend(self.children_of(index))
+
+        unreachable = [self.ids[index] for index in range(len(self.ids)) if not reached[index]]
+        unreachable_nodes = {node_id: {'pid': self.pids[self.index[node_id]]} for node_id in unreachable}
+        report = {
+            'unreachable': unreachable,
+            'cycles': find_parent_cycles(unreachable_nodes, unreachable),
+            'duplicates': self.duplicates
+        }
+        return [NodeView(self, index) for index in roots], report
+
+
+class NodeView(Mapping):
+    """Dict-like view of one model node with the keys of a JSON node"""
+
+    __slots__ = ('_model', '_index')
+
+    def __init__(self, model, index):
+        self._model = model
+        self._index = index
+
+    def __getitem__(self, key):
+        model, index = self._model, self._index
+        if key == 'id':
+            return model.ids[index]
+        if key == 'name':
+            return model.names[index]
+        if key == 'pid':
+            return model.pids[index]
+        if key == 'level':
+            return model.levels[model.level_codes[index]]
+        if key == 'children':
+            return [NodeView(model, child) for child in model.children_of(index)]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(NODE_KEYS)
+
+    def __len__(self):
+        return len(NODE_KEYS)
+
+    def items(self):
+        model, index = self._model, self._index
+        return [
+            ('id', model.ids[index]),
+            ('name', model.names[index]),
+            ('pid', model.pids[index]),
+            ('level', model.levels[model.level_codes[index]]),
+            ('children', [NodeView(model, child) for child in model.children_of(index)]),
+        ]
+
+    def __repr__(self):
+        return f"NodeView({dict(self.items())!r})"
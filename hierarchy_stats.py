@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Statistics engine for organigram hierarchies
+Computes depth, level, fan-out and subtree-size distributions, orphans and
+parent cycles of a HierarchyModel in one traversal, as a JSON-ready dict
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import sys
+from array import array
+from collections import Counter
+from operator import sub
+
+from hierarchy_builder import find_parent_cycles
+from hierarchy_model import HierarchyModel
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(sorted_values, points=PERCENTILES):
+    """Nearest-rank percentiles of an ascending list, plus its maximum"""
+    if not sorted_values:
+        return {}
+    result = {f"p{point}": sorted_values[max(math.ceil(point / 100 * len(sorted_values)) - 1, 0)]
+              for point in points}
+    result['max'] = sorted_values[-1]
+    return result
+
+
+def bucket_label(bits):
+    """Label of a power-of-two histogram bucket, from int.bit_length() of its values"""
+    if bits <= 1:
+        return str(bits)
+    return f"{1 << (bits - 1)}-{(1 << bits) - 1}"
+
+
+def hierarchy_statistics(model, largest=10):
+    """Statistics of a HierarchyModel, in one breadth-first pass from its roots
+
+    The traversal visits each reachable node once, collecting the depth
+    distribution; walking its visiting order backwards then sums subtree
+    sizes. Fan-out comes straight from the model's child index ranges. Depth
+    is counted in edges (roots are at depth 0); fan-out and subtree-size
+    percentiles cover nodes that have children.
+    """
+    if model.parents is None:
+        model.link()
+    count = len(model)
+    parents, offsets, child_index = model.parents, model.child_offsets, model.child_index
+    ids, names, pids = model.ids, model.names, model.pids
+
+    roots = [index for index, pid in enumerate(pids) if pid is None]
+    order = []
+    depth_counts = []
+    frontier = roots
+    while frontier:
+        depth_counts.append(len(frontier))
+        order.extend(frontier)
+        next_frontier = []
+        for index in frontier:
+            next_frontier.extend(child_index[offsets[index]:offsets[index + 1]])
+        frontier = next_frontier
+
+    sizes = array('I', [1]) * count
+    for index in reversed(order):
+        parent = parents[index]
+        if parent >= 0:
+            sizes[parent] += sizes[index]
+
+    fan_out = list(map(sub, offsets[1:], offsets[:-1]))
+    internal = [index for index in order if fan_out[index]]
+    child_counts = sorted(fan_out[index] for index in internal)
+    histogram = Counter(map(int.bit_length, fan_out))
+
+    levels = dict(sorted((model.levels[code], level_count)
+                         for code, level_count in Counter(model.level_codes).items() if model.levels[code]))
+
+    unreachable = []
+    if len(order) < count:
+        reached = bytearray(count)
+        for index in order:
+            reached[index] = 1
+        unreachable = [ids[index] for index in range(count) if not reached[index]]
+    unreachable_nodes = {node_id: {'pid': pids[model.index[node_id]]} for node_id in unreachable}
+
+    largest_roots = sorted(roots, key=lambda index: sizes[index], reverse=True)[:largest]
+    return {
+        'total_nodes': count,
+        'root_nodes': len(roots),
+        'reachable_nodes': len(order),
+        'max_depth': max(len(depth_counts) - 1, 0),
+        'depth_distribution': dict(enumerate(depth_counts)),
+        'levels': levels,
+        'max_children': max(fan_out, default=0),
+        'fan_out': {
+            'mean': round(sum(child_counts) / len(child_counts), 2) if child_counts else 0,
+            'percentiles': percentiles(child_counts),
+            'histogram': {bucket_label(bits): histogram[bits] for bits in sorted(histogram)},
+        },
+        'subtree_sizes': {
+            'percentiles': percentiles(sorted(sizes[index] for index in internal)),
+            'largest_roots': [{'id': ids[index], 'name': names[index], 'size': sizes[index]}
+                              for index in largest_roots],
+        },
+        'orphaned_nodes': [{'id': ids[index], 'name': names[index], 'missing_parent': pids[index]}
+                           for index in range(count) if pids[index] is not None and parents[index] < 0],
+        'unreachable_nodes': len(unreachable),
+        'cycles': find_parent_cycles(unreachable_nodes, unreachable),
+        'duplicate_rows': len(model.duplicates),
+    }
+
+
+def statistics_from_nodes(nodes, largest=10):
+    """hierarchy_statistics for a dict of node dicts (id -> {'name', 'pid', 'level', ...})"""
+    model = HierarchyModel()
+    for node_id, node in nodes.items():
+        if node_id is not None:
+            model.add(node_id, node['name'], node['pid'], node['level'])
+    return hierarchy_statistics(model, largest)
+
+
+def save_statistics(stats, output_path):
+    """Write statistics as JSON"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print hierarchy statistics of a CSV file as JSON",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 hierarchy_stats.py nodes.csv
+  python3 hierarchy_stats.py nodes.csv -o nodes_stats.json
+        """
+    )
+    parser.add_argument('input_file', help='CSV file with name, id, pid and level columns')
+    parser.add_argument('-o', '--output', help='Write the JSON to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    try:
+        # Imported here: the importers use this module for their statistics
+        from import_organigram_simple import SimpleOrganigramImporter
+
+        importer = SimpleOrganigramImporter()
+        with contextlib.redirect_stdout(sys.stderr):
+            importer.process_rows(importer.load_csv(args.input_file))
+        stats = hierarchy_statistics(importer.model)
+        if args.output:
+            save_statistics(stats, args.output)
+            print(f"✅ Statistics saved: {args.output}")
+        else:
+            print(json.dumps(stats, indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped binary store for organigram hierarchies
+Answers node, parent-chain and children queries straight from the file via
+mmap, without parsing or loading the whole hierarchy
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import zlib
+
+from hierarchy_columnar import columnar_from_hierarchy
+
+STORE_MAGIC = b'ORGH'
+STORE_VERSION = 2
+# String length recorded for a missing (None) name or level
+NULL_LENGTH = 0xFFFFFFFF
+
+# magic, version, node count, root count, index slots, records/index/heap offsets
+HEADER = struct.Struct('<4sIIIIQQQ')
+# parent index (-1 for roots), first child index, child count,
+# then (heap offset, byte length) of the id, name and level strings
+RECORD = struct.Struct('<iIIIIIIII')
+SLOT = struct.Struct('<I')
+
+
+def id_hash(id_bytes):
+    """Hash used by the on-disk id index"""
+    return zlib.crc32(id_bytes)
+
+
+def store_path(output_path):
+    """Path of the binary store written next to a nested JSON output"""
+    output_path = str(output_path)
+    stem = output_path[:-5] if output_path.endswith('.json') else output_path
+    return f"{stem}.orgh"
+
+
+def write_store(root_nodes, output_path):
+    """Write a hierarchy as a binary store, returning the bytes written
+
+    Records are fixed-width and numbered breadth-first (the columnar order),
+    so a node's children are the records first_child .. first_child + count - 1.
+    Strings live in a deduplicated UTF-8 heap. The id index is an open
+    addressing hash table of record numbers + 1 (0 marks an empty slot).
+    A None name or level is stored with length NULL_LENGTH.
+    """
+    data = columnar_from_hierarchy(root_nodes)
+    # Lookups are by string id, whatever type the caller's ids have
+    ids = [str(node_id) for node_id in data['ids']]
+    offsets = data['child_offsets']
+
+    heap = bytearray()
+    heap_refs = {}
+
+    def add_string(text):
+        if text is None:
+            return 0, NULL_LENGTH
+        ref = heap_refs.get(text)
+        if ref is None:
+            encoded = text.encode('utf-8')
+            ref = heap_refs[text] = (len(heap), len(encoded))
+            heap.extend(encoded)
+        return ref
+
+    level_refs = [add_string(level) for level in data['levels']]
+    name_refs = [add_string(name) for name in data['names']]
+
+    records = bytearray(RECORD.size * len(ids))
+    for index, node_id in enumerate(ids):
+        RECORD.pack_into(records, index * RECORD.size,
+                         data['parents'][index], offsets[index], offsets[index + 1] - offsets[index],
+                         *add_string(node_id),
+                         *name_refs[data['name_codes'][index]],
+                         *level_refs[data['level_codes'][index]])
+
+    slot_count = 1
+    while slot_count < 2 * len(ids):
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = [0] * slot_count
+    for index, node_id in enumerate(ids):
+        slot = id_hash(node_id.encode('utf-8')) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = index + 1
+    index_table = struct.pack(f'<{slot_count}I', *slots)
+
+    records_offset = HEADER.size
+    index_offset = records_offset + len(records)
+    heap_offset = index_offset + len(index_table)
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(STORE_MAGIC, STORE_VERSION, len(ids), data['roots'], slot_count,
+                            records_offset, index_offset, heap_offset))
+        f.write(records)
+        f.write(index_table)
+        f.write(heap)
+        return f.tell()
+
+
+class HierarchyStore:
+    """Read-only, memory-mapped view of a binary hierarchy store"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty hierarchy store: {path}")
+
+        (magic, version, self.node_count, self.root_count, self._slot_count,
+         self._records, self._index, self._heap) = HEADER.unpack_from(self._map, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"Not an organigram hierarchy store (v{STORE_VERSION}): {path}")
+        self._mask = self._slot_count - 1
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.node_count
+
+    def __contains__(self, node_id):
+        return self.find(node_id) is not None
+
+    def _string(self, offset, length):
+        if length == NULL_LENGTH:
+            return None
+        start = self._heap + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._map, self._records + index * RECORD.size)
+
+    def find(self, node_id):
+        """Record number of a node id, or None if the store doesn't contain it"""
+        id_bytes = str(node_id).encode('utf-8')
+        slot = id_hash(id_bytes) & self._mask
+        while True:
+            (entry,) = SLOT.unpack_from(self._map, self._index + slot * SLOT.size)
+            if not entry:
+                return None
+            _, _, _, id_offset, id_length, _, _, _, _ = self._record(entry - 1)
+            if id_length == len(id_bytes):
+                start = self._heap + id_offset
+                if self._map[start:start + id_length] == id_bytes:
+                    return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def node_at(self, index):
+        """The node stored in record `index` as an {id, name, pid, level} dict"""
+        parent, _, _, id_offset, id_length, name_offset, name_length, level_offset, level_length = self._record(index)
+        return {
+            'id': self._string(id_offset, id_length),
+            'name': self._string(name_offset, name_length),
+            'pid': None if parent < 0 else self._string(*self._record(parent)[3:5]),
+            'level': self._string(level_offset, level_length),
+        }
+
+    def _require(self, node_id):
+        index = self.find(node_id)
+        if index is None:
+            raise KeyError(node_id)
+        return index
+
+    def node(self, node_id):
+        """Look up one node by id (KeyError if absent)"""
+        return self.node_at(self._require(node_id))
+
+    def parent_chain(self, node_id):
+        """The node's ancestors, nearest first, ending at its root"""
+        chain = []
+        parent = self._record(self._require(node_id))[0]
+        while parent >= 0:
+            chain.append(self.node_at(parent))
+            parent = self._record(parent)[0]
+        return chain
+
+    def children(self, node_id):
+        """The node's children, in output order"""
+        _, first_child, child_count = self._record(self._require(node_id))[:3]
+        return [self.node_at(index) for index in range(first_child, first_child + child_count)]
+
+    def roots(self):
+        """The root nodes"""
+        return [self.node_at(index) for index in range(self.root_count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or query a memory-mapped hierarchy store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 hierarchy_store.py build nodes_hierarchy.json
+  python3 hierarchy_store.py show nodes_hierarchy.orgh 3
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='Convert nested hierarchy JSON to a store')
+    build_parser.add_argument('input_file', help='Nested hierarchy JSON (e.g. nodes_hierarchy.json)')
+    build_parser.add_argument('-o', '--output', help='Output path (default: <input>.orgh)')
+    show_parser = subparsers.add_parser('show', help='Print a node with its parent chain and children')
+    show_parser.add_argument('store', help='Hierarchy store file')
+    show_parser.add_argument('node_id', help='Node id to look up')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'build':
+            output_path = args.output or store_path(args.input_file)
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                hierarchy = json.load(f)
+            file_size = write_store(hierarchy, output_path)
+            print(f"✅ Hierarchy store saved: {output_path} ({file_size:,} bytes)")
+        else:
+            with HierarchyStore(args.store) as store:
+                node = store.node(args.node_id)
+                print(f"{node['name']} (ID: {node['id']}, {node['level']})")
+                for ancestor in store.parent_chain(args.node_id):
+                    print(f"  ↑ {ancestor['name']} (ID: {ancestor['id']})")
+                for child in store.children(args.node_id):
+                    print(f"  ↓ {child['name']} (ID: {child['id']})")
+    except KeyError as e:
+        print(f"❌ Node not found: {e.args[0]}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
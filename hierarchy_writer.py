@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON writer for organigram hierarchies
+Serializes the nested node structure depth-first straight to the output file,
+producing the same text as json.dump(..., indent=2, ensure_ascii=False)
+without recursion, plus an optional compact form and compressed copy
+"""
+
+import contextlib
+import gzip
+import json
+import os
+import sys
+from json.encoder import encode_basestring
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Characters buffered before each write to the output file(s)
+WRITE_BUFFER_SIZE = 256 * 1024
+
+COMPRESSED_SUFFIXES = {
+    'gzip': '.gz',
+    'brotli': '.br',
+}
+
+
+def encode_value(value):
+    """JSON-encode a scalar node field"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return 'null'
+    return json.dumps(value, ensure_ascii=False)
+
+
+def iter_hierarchy_json(root_nodes, indent=2, spans=None, verbatim=None):
+    """Yield the JSON text of a nested hierarchy in small chunks
+
+    Nodes are dicts whose 'children' key (written last) holds their child
+    node dicts; every other key is written as a scalar in dict order. With
+    indent=None the output is compact, with no whitespace at all.
+
+    If spans is a dict, spans[node id] is set to [start, end, depth]: the
+    character range of the node's object in the output and its indent depth.
+    verbatim(node, depth), if given, may return the finished text of a
+    node's whole object (e.g. copied from an earlier output); that text is
+    written as-is and the node's children are not visited.
+    """
+    if indent is None:
+        key_separator = ':'
+
+        def newline(level):
+            return ''
+    else:
+        key_separator = ': '
+
+        def newline(level):
+            return '\n' + ' ' * (indent * level)
+
+    if not root_nodes:
+        yield '[]'
+        return
+
+    yield '['
+    position = 1
+    # Each frame is [iterator over a node list, indent level of its items, first item?, owning node id]
+    stack = [[iter(root_nodes), 1, True, None]]
+    while stack:
+        frame = stack[-1]
+        nodes, level, first, _ = frame
+        node = next(nodes, None)
+
+        if node is None:
+            stack.pop()
+            chunk = newline(level - 1) + ']'
+            if stack:
+                # This list was a node's children, so the node is complete too
+                chunk += newline(level - 2) + '}'
+                if spans is not None:
+                    spans[frame[3]][1] = position + len(chunk)
+            position += len(chunk)
+            yield chunk
+            continue
+
+        frame[2] = False
+        prefix = ('' if first else ',') + newline(level)
+        if verbatim is not None:
+            text = verbatim(node, level)
+            if text is not None:
+                if spans is not None:
+                    start = position + len(prefix)
+                    spans[node['id']] = [start, start + len(text), level]
+                chunk = prefix + text
+                position += len(chunk)
+                yield chunk
+                continue
+
+        fields_indent = newline(level + 1)
+        parts = [prefix + '{']
+        children = None
+        for key, value in node.items():
+            if key == 'children':
+                children = value
+            else:
+                parts.append(f"{fields_indent}{encode_basestring(key)}{key_separator}{encode_value(value)},")
+        parts.append(f'{fields_indent}"children"{key_separator}')
+
+        if children:
+            parts.append('[')
+            stack.append([iter(children), level + 2, True, node['id']])
+        else:
+            parts.append('[]' + newline(level) + '}')
+        chunk = ''.join(parts)
+        if spans is not None:
+            start = position + len(prefix)
+            # A node with children gets its end once its list closes
+            spans[node['id']] = [start, position + len(chunk) if not children else None, level]
+        position += len(chunk)
+        yield chunk
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def open_compressed(path, compress):
+    """Open a text-mode compressed sibling file for writing"""
+    if compress == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8')
+    if compress == 'brotli':
+        try:
+            import brotli
+        except ImportError:
+            raise ValueError("brotli is required for .br output. Install with: pip install brotli")
+        return BrotliTextWriter(path, brotli)
+    raise ValueError(f"Unsupported compression: {compress}. Supported: {', '.join(COMPRESSED_SUFFIXES)}")
+
+
+class BrotliTextWriter:
+    """Minimal text-mode file object that brotli-compresses as it writes"""
+
+    def __init__(self, path, brotli):
+        self._file = open(path, 'wb')
+        self._compressor = brotli.Compressor()
+
+    def write(self, text):
+        self._file.write(self._compressor.process(text.encode('utf-8')))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.write(self._compressor.finish())
+        self._file.close()
+
+
+def write_chunk(file, compressed, text):
+    """Write text to the output file and its compressed sibling, if any"""
+    file.write(text)
+    if compressed is not None:
+        compressed.write(text)
+
+
+def save_hierarchy_json(root_nodes, output_path, compact=False, compress=None, spans=None, verbatim=None):
+    """Stream a hierarchy to output_path, optionally with a compressed sibling
+
+    Returns a dict with the bytes written and, when compress is 'gzip' or
+    'brotli', the path and size of the compressed copy. spans and verbatim
+    are passed on to iter_hierarchy_json.
+    """
+    compressed_path = f"{output_path}{COMPRESSED_SUFFIXES.get(compress, '')}" if compress else None
+    sibling = open_compressed(compressed_path, compress) if compress else contextlib.nullcontext()
+
+    with open(output_path, 'w', encoding='utf-8') as file, sibling as compressed:
+        buffer = []
+        buffered = 0
+        for chunk in iter_hierarchy_json(root_nodes, indent=None if compact else 2,
+                                         spans=spans, verbatim=verbatim):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= WRITE_BUFFER_SIZE:
+                write_chunk(file, compressed, ''.join(buffer))
+                buffer = []
+                buffered = 0
+        write_chunk(file, compressed, ''.join(buffer))
+
+    result = {'bytes_written': os.path.getsize(output_path)}
+    if compressed_path:
+        result['compressed_path'] = compressed_path
+        result['compressed_bytes'] = os.path.getsize(compressed_path)
+    return result
+
+
+def save_compressed_copy(output_path, compress):
+    """(Re)write the compressed sibling of an existing output, returning its path and size"""
+    compressed_path = f"{output_path}{COMPRESSED_SUFFIXES.get(compress, '')}"
+    with open(output_path, 'r', encoding='utf-8') as file, open_compressed(compressed_path, compress) as compressed:
+        for block in iter(lambda: file.read(WRITE_BUFFER_SIZE), ''):
+            compressed.write(block)
+    return {'compressed_path': compressed_path, 'compressed_bytes': os.path.getsize(compressed_path)}
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for organigram imports
+Maps a hash of the input bytes plus the importer options to the files and
+statistics an import produced, so re-importing an unchanged file only copies
+the cached outputs back into place
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# Bump when a change to the importers alters their outputs or statistics for the same input
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'organigram-import')
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+STATS_FILE = 'stats.json'
+
+
+def default_cache_dir():
+    """ORGANIGRAM_CACHE_DIR, or ~/.cache/organigram-import"""
+    return os.path.expanduser(os.environ.get('ORGANIGRAM_CACHE_DIR', DEFAULT_CACHE_DIR))
+
+
+class ImportCache:
+    """Directory of cached imports, evicted least recently used first
+
+    Each entry is a subdirectory named by its key, holding one file per
+    output role ('json', 'columnar', ...) and the import statistics. An
+    entry's mtime records its last use.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, input_paths, options):
+        """Hex digest of the input files' bytes (in order) and the importer options"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'version': CACHE_VERSION, 'options': options}, sort_keys=True).encode('utf-8'))
+        for input_path in input_paths:
+            digest.update(b'\0')
+            with open(input_path, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, key, outputs):
+        """Copy a cached import's files to `outputs` ({role: path}), returning its statistics
+
+        Returns None on a miss, including when the entry lacks one of the
+        requested roles.
+        """
+        entry = self._entry(key)
+        stats_path = os.path.join(entry, STATS_FILE)
+        if not os.path.exists(stats_path) or not all(os.path.exists(os.path.join(entry, role)) for role in outputs):
+            return None
+
+        for role, path in outputs.items():
+            shutil.copyfile(os.path.join(entry, role), path)
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        os.utime(entry)
+        return stats
+
+    def store(self, key, outputs, stats):
+        """Cache the files in `outputs` ({role: path}) and the statistics under key"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.cache_dir)
+        try:
+            for role, path in outputs.items():
+                shutil.copyfile(path, os.path.join(staging, role))
+            with open(os.path.join(staging, STATS_FILE), 'w', encoding='utf-8') as f:
+                json.dump(stats, f, ensure_ascii=False)
+
+            entry = self._entry(key)
+            shutil.rmtree(entry, ignore_errors=True)
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # Another import stored the same key first
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """(last used, bytes, path) of every entry, least recently used first"""
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for item in scan:
+                if item.is_dir() and not item.name.startswith('.'):
+                    size = sum(os.path.getsize(os.path.join(item.path, name)) for name in os.listdir(item.path))
+                    entries.append((item.stat().st_mtime, size, item.path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -5,18 +5,32 @@ Converts CSV and Excel files to the JSON format required by the organigram appli
 """
 
 import csv
-import json
+import numpy as np
 import pandas as pd
 import argparse
-import os
+import contextlib
+import io
 import sys
-from collections import defaultdict
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+from encoding_detection import detect_encoding
+from hierarchy_columnar import columnar_path, write_columnar
+from hierarchy_model import HierarchyModel
+from hierarchy_stats import hierarchy_statistics, save_statistics
+from hierarchy_store import store_path, write_store
+from hierarchy_writer import COMPRESSED_SUFFIXES, peak_rss_bytes, save_hierarchy_json
+from import_cache import DEFAULT_CACHE_SIZE, ImportCache
+from incremental_import import discard_manifest, save_incremental
+
+# Rows handed to the node builder at a time when streaming Excel sheets
+EXCEL_CHUNK_ROWS = 10000
+
 class OrganigramImporter:
     def __init__(self):
-        self.nodes = {}
-        self.children_map = defaultdict(list)
+        self.model = HierarchyModel()
         self.required_columns = ['name', 'id', 'pid', 'level']
         
     def clean_field(self, field):
@@ -25,6 +39,17 @@ class OrganigramImporter:
             return None
         return str(field).strip().strip('"')
     
+    def clean_column(self, column):
+        """Vectorized clean_field over a whole column, returned as an object array"""
+        # Integer ids in a column with missing values are read as floats (191.0)
+        if pd.api.types.is_float_dtype(column) and (column.dropna() % 1 == 0).all():
+            column = column.astype('Int64')
+        
+        missing = (column.isna() | column.isin(['NULL', ''])).to_numpy()
+        cleaned = column.astype(str).str.strip().str.strip('"').to_numpy(dtype=object)
+        cleaned[missing] = None
+        return cleaned
+    
     def validate_columns(self, df):
         """Validate that required columns are present"""
         missing_columns = [col for col in self.required_columns if col not in df.columns]
@@ -43,20 +68,10 @@ class OrganigramImporter:
         print(f"📁 Loading CSV file: {file_path}")
         
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding)
-                    print(f"✅ Successfully loaded with {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
-                raise ValueError("Could not read CSV file with any supported encoding")
+            # Detect the encoding once so the file is parsed a single time
+            encoding = detect_encoding(file_path)
+            df = pd.read_csv(file_path, encoding=encoding)
+            print(f"✅ Successfully loaded with {encoding} encoding")
             
             return df
             
@@ -69,7 +84,7 @@ class OrganigramImporter:
         
         try:
             # Check if openpyxl is available for .xlsx files
-            if file_path.endswith('.xlsx'):
+            if str(file_path).endswith('.xlsx'):
                 try:
                     import openpyxl
                 except ImportError:
@@ -97,9 +112,50 @@ class OrganigramImporter:
         
         self.validate_columns(df)
         
-        # Clean and process each row
-        for index, row in df.iterrows():
-            try:
+        # Clean each required column in one vectorized pass
+        ids = self.clean_column(df['id'])
+        pids = self.clean_column(df['pid'])
+        names = self.clean_column(df['name'])
+        levels = self.clean_column(df['level'])
+        
+        # Skip rows with missing essential data
+        valid = pd.notna(ids) & (ids != '') & pd.notna(names) & (names != '')
+        for position in np.flatnonzero(~valid):
+            print(f"⚠️  Skipping row {df.index[position] + 1}: Missing ID or name")
+        ids, pids, names, levels = ids[valid], pids[valid], names[valid], levels[valid]
+        
+        # Store node information, then link parents and children by index
+        for node_id, name, pid, level in zip(ids, names, pids, levels):
+            self.model.add(node_id, name, pid, level)
+        self.model.link()
+        
+        print(f"✅ Processed {len(self.model)} nodes successfully")
+    
+    def process_csv_stream(self, file_path):
+        """Build node relationships straight from a CSV file, one row at a time
+        
+        For files too large to load as a DataFrame. Values are cleaned the same
+        way as in process_dataframe, but ids are kept exactly as written.
+        """
+        print(f"🔄 Streaming rows from {file_path}...")
+        
+        # Detect the encoding up front so a late bad byte can't force a restart
+        encoding = detect_encoding(file_path)
+        self._stream_csv_rows(file_path, encoding)
+        print(f"✅ Successfully read with {encoding} encoding")
+        
+        self.model.link()
+        print(f"✅ Processed {len(self.model)} nodes successfully")
+    
+    def _stream_csv_rows(self, file_path, encoding):
+        """Add a node per CSV row without materializing the file"""
+        with open(file_path, 'r', encoding=encoding, newline='') as file:
+            reader = csv.DictReader(file)
+            missing_columns = [col for col in self.required_columns if col not in (reader.fieldnames or [])]
+            if missing_columns:
+                raise ValueError(f"Missing required columns: {missing_columns}")
+            
+            for index, row in enumerate(reader):
                 node_id = self.clean_field(row['id'])
                 pid = self.clean_field(row['pid'])
                 name = self.clean_field(row['name'])
@@ -110,104 +166,208 @@ class OrganigramImporter:
                     print(f"⚠️  Skipping row {index + 1}: Missing ID or name")
                     continue
                 
-                # Store node information
-                self.nodes[node_id] = {
-                    'id': node_id,
-                    'name': name,
-                    'pid': pid,
-                    'level': level,
-                    'children': []
-                }
-                
-                # Build parent-child relationships
-                if pid and pid != 'NULL':
-                    self.children_map[pid].append(node_id)
-                    
-            except Exception as e:
-                print(f"⚠️  Error processing row {index + 1}: {str(e)}")
-                continue
+                self.model.add(node_id, name, pid, level)
+    
+    def process_excel_stream(self, file_path, sheet_name=None, chunk_size=EXCEL_CHUNK_ROWS):
+        """Build node relationships from an .xlsx sheet without loading it whole
         
-        # Add children to each node
-        for parent_id, child_ids in self.children_map.items():
-            if parent_id in self.nodes:
-                self.nodes[parent_id]['children'] = child_ids
+        Uses openpyxl's read-only mode, which parses the sheet as rows are
+        requested, and feeds the rows to the node builder in chunks.
+        """
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("openpyxl is required for .xlsx files. Install with: pip install openpyxl")
         
-        print(f"✅ Processed {len(self.nodes)} nodes successfully")
+        print(f"📁 Streaming Excel file: {file_path}")
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name is None:
+                if len(workbook.sheetnames) > 1:
+                    print(f"📋 Available sheets: {workbook.sheetnames}")
+                    print(f"📋 Using first sheet: '{workbook.sheetnames[0]}'")
+                sheet_name = workbook.sheetnames[0]
+            elif sheet_name not in workbook.sheetnames:
+                raise ValueError(f"Worksheet '{sheet_name}' not found. Available sheets: {workbook.sheetnames}")
+            
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = [self.clean_excel_value(value) for value in next(rows, ())]
+            missing_columns = [col for col in self.required_columns if col not in header]
+            if missing_columns:
+                raise ValueError(f"Missing required columns: {missing_columns}")
+            columns = [header.index(col) for col in ('id', 'pid', 'name', 'level')]
+            
+            start = time.perf_counter()
+            row_count = 0
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self._add_excel_rows(chunk, columns, row_count)
+                row_count += len(chunk)
+                elapsed = time.perf_counter() - start
+                print(f"   ... {row_count:,} rows ({row_count / elapsed:,.0f} rows/sec)")
+        finally:
+            workbook.close()
+        
+        self.model.link()
+        print(f"✅ Processed {len(self.model)} nodes successfully from sheet '{sheet_name}'")
+    
+    def clean_excel_value(self, value):
+        """clean_field for a cell value; whole-number floats become integer ids"""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return self.clean_field(value)
+    
+    def _add_excel_rows(self, rows, columns, first_row):
+        """Add a node for each sheet row in a chunk"""
+        id_column, pid_column, name_column, level_column = columns
+        clean = self.clean_excel_value
+        for offset, row in enumerate(rows):
+            if len(row) <= max(columns):
+                row = tuple(row) + (None,) * (max(columns) + 1 - len(row))
+            node_id = clean(row[id_column])
+            name = clean(row[name_column])
+            
+            # Skip rows with missing essential data (the header is spreadsheet row 1)
+            if not node_id or not name:
+                print(f"⚠️  Skipping row {first_row + offset + 1}: Missing ID or name")
+                continue
+            
+            self.model.add(node_id, name, clean(row[pid_column]), clean(row[level_column]))
     
     def create_hierarchical_structure(self):
         """Create the hierarchical JSON structure"""
         print("🌳 Building hierarchical structure...")
         
-        # Find root nodes (those with no parent or NULL parent)
-        root_nodes = []
+        # Root nodes are those with no parent or NULL parent
+        root_nodes, report = self.model.build_hierarchy()
         
-        for node_id, node in self.nodes.items():
-            if node['pid'] is None:
-                root_nodes.append(self.build_tree(node_id))
+        for cycle in report['cycles']:
+            print(f"⚠️  Parent cycle left out of the hierarchy: {' -> '.join(cycle + cycle[:1])}")
+        if report['duplicates']:
+            print(f"⚠️  {len(report['duplicates'])} rows repeat an earlier node id (the last row is kept)")
         
         print(f"🌲 Found {len(root_nodes)} root nodes")
         return root_nodes
     
-    def build_tree(self, node_id):
-        """Recursively build tree structure"""
-        if node_id not in self.nodes:
-            return None
-        
-        node = self.nodes[node_id].copy()
-        node['children'] = []
-        
-        for child_id in self.nodes[node_id]['children']:
-            child_tree = self.build_tree(child_id)
-            if child_tree:
-                node['children'].append(child_tree)
-        
-        return node
-    
     def generate_statistics(self, hierarchy):
-        """Generate statistics about the imported data"""
-        stats = {
-            'total_nodes': len(self.nodes),
-            'root_nodes': len(hierarchy),
-            'levels': defaultdict(int),
-            'max_children': 0,
-            'orphaned_nodes': []
-        }
+        """Generate statistics about the imported data (see hierarchy_stats.py)"""
+        return hierarchy_statistics(self.model)
+    
+    def save_json(self, hierarchy, output_path, compact=False, compress=None):
+        """Stream the hierarchical structure to a JSON file"""
+        print(f"💾 Saving to: {output_path}")
         
-        # Count nodes by level and find max children
-        for node in self.nodes.values():
-            if node['level']:
-                stats['levels'][node['level']] += 1
+        try:
+            result = save_hierarchy_json(hierarchy, output_path, compact=compact, compress=compress)
+            print(f"✅ JSON file saved successfully ({result['bytes_written']:,} bytes)")
+            if compress:
+                print(f"🗜️  Compressed copy: {result['compressed_path']} ({result['compressed_bytes']:,} bytes)")
             
-            children_count = len(node['children'])
-            if children_count > stats['max_children']:
-                stats['max_children'] = children_count
+            peak_rss = peak_rss_bytes()
+            if peak_rss:
+                print(f"📈 Peak memory (RSS): {peak_rss / 1024 / 1024:,.1f} MB")
             
-            # Check for orphaned nodes (have parent ID but parent doesn't exist)
-            if node['pid'] and node['pid'] not in self.nodes:
-                stats['orphaned_nodes'].append({
-                    'id': node['id'],
-                    'name': node['name'],
-                    'missing_parent': node['pid']
-                })
+        except Exception as e:
+            raise ValueError(f"Error saving JSON file: {str(e)}")
+    
+    def save_json_incremental(self, hierarchy, output_path, compact=False, compress=None):
+        """Save the JSON file, re-serializing only what changed since the previous import"""
+        print(f"💾 Updating: {output_path}")
         
-        return stats
+        try:
+            result = save_incremental(self.model, hierarchy, output_path, compact=compact, compress=compress)
+        except Exception as e:
+            raise ValueError(f"Error saving JSON file: {str(e)}")
+        
+        if result['mode'] == 'full':
+            print(f"ℹ️  Full write: {result['reason']}")
+            print(f"✅ JSON file saved successfully ({result['bytes_written']:,} bytes, manifest written)")
+        else:
+            counts = ', '.join(f"{len(entries)} {kind}" for kind, entries in result['changes'].items())
+            print(f"🔁 Changes since the previous import: {counts}")
+            if result['mode'] == 'unchanged':
+                print(f"✅ JSON file is up to date ({result['bytes_written']:,} bytes)")
+            else:
+                print(f"✅ JSON file patched ({result['bytes_written']:,} bytes): "
+                      f"{result['rewritten']:,} nodes rewritten, {result['copied']:,} subtrees copied")
+            print(f"📝 Changeset: {result['changes_path']}")
+        if compress:
+            print(f"🗜️  Compressed copy: {result['compressed_path']} ({result['compressed_bytes']:,} bytes)")
+        return result
     
-    def save_json(self, hierarchy, output_path):
-        """Save the hierarchical structure to JSON file"""
-        print(f"💾 Saving to: {output_path}")
+    def save_columnar(self, hierarchy, output_path):
+        """Save the hierarchy in the flat columnar format"""
+        print(f"💾 Saving columnar file to: {output_path}")
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(hierarchy, f, indent=2, ensure_ascii=False)
+            file_size = write_columnar(hierarchy, output_path)
+            print(f"✅ Columnar file saved successfully ({file_size:,} bytes)")
             
-            file_size = os.path.getsize(output_path)
-            print(f"✅ JSON file saved successfully ({file_size:,} bytes)")
+        except Exception as e:
+            raise ValueError(f"Error saving columnar file: {str(e)}")
+    
+    def save_store(self, hierarchy, output_path):
+        """Save the hierarchy as a memory-mapped binary store"""
+        print(f"💾 Saving hierarchy store to: {output_path}")
+        
+        try:
+            file_size = write_store(hierarchy, output_path)
+            print(f"✅ Hierarchy store saved successfully ({file_size:,} bytes)")
             
         except Exception as e:
-            raise ValueError(f"Error saving JSON file: {str(e)}")
+            raise ValueError(f"Error saving hierarchy store: {str(e)}")
+    
+    def load_file(self, input_path, sheet_name=None, stream=False):
+        """Read one CSV or Excel file into the node model"""
+        input_path = Path(input_path)
+        file_ext = input_path.suffix.lower()
+        
+        if file_ext == '.csv' and stream:
+            self.process_csv_stream(input_path)
+        elif file_ext == '.xlsx' and stream:
+            self.process_excel_stream(input_path, sheet_name)
+        else:
+            if file_ext == '.csv':
+                df = self.load_csv(input_path)
+            elif file_ext in ['.xlsx', '.xls']:
+                df = self.load_excel(input_path, sheet_name)
+            else:
+                raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: .csv, .xlsx, .xls")
+            
+            # Process the data
+            self.process_dataframe(df)
+    
+    def build_and_save(self, output_path, compact=False, compress=None, columnar=False, store=False, incremental=False):
+        """Build the hierarchy from the loaded nodes, report statistics and write the outputs"""
+        # Create hierarchical structure
+        hierarchy = self.create_hierarchical_structure()
+        
+        # Generate and display statistics
+        stats = self.generate_statistics(hierarchy)
+        self.display_statistics(stats)
+        
+        # Save JSON file
+        if incremental:
+            self.save_json_incremental(hierarchy, output_path, compact=compact, compress=compress)
+        else:
+            self.save_json(hierarchy, output_path, compact=compact, compress=compress)
+        if columnar:
+            self.save_columnar(hierarchy, columnar_path(output_path))
+        if store:
+            self.save_store(hierarchy, store_path(output_path))
+        
+        return stats
     
-    def import_file(self, input_path, output_path=None, sheet_name=None):
-        """Main import function"""
+    def import_file(self, input_path, output_path=None, sheet_name=None, stream=False, compact=False, compress=None, columnar=False, store=False,
+                    incremental=False, cache=None):
+        """Main import function
+        
+        With an ImportCache, an input identical to a cached import (same bytes
+        and options) restores the cached outputs instead of importing again.
+        Incremental imports bypass the cache.
+        """
         input_path = Path(input_path)
         
         if not input_path.exists():
@@ -221,47 +381,152 @@ class OrganigramImporter:
         print(f"📄 Input: {input_path}")
         print(f"📄 Output: {output_path}")
         
-        # Load file based on extension
-        file_ext = input_path.suffix.lower()
+        cache_key = None
+        outputs = self.output_roles(output_path, compress, columnar, store)
+        if cache is not None and not incremental:
+            options = {'importer': 'advanced', 'sheet': sheet_name, 'stream': stream,
+                       'compact': compact, 'compress': compress}
+            cache_key, stats = self.restore_from_cache(cache, [input_path], options, outputs)
+            if stats is not None:
+                return output_path, stats
+        
+        self.load_file(input_path, sheet_name, stream)
+        stats = self.build_and_save(output_path, compact=compact, compress=compress, columnar=columnar, store=store,
+                                    incremental=incremental)
+        if cache_key:
+            self.save_to_cache(cache, cache_key, outputs, stats)
         
-        if file_ext == '.csv':
-            df = self.load_csv(input_path)
-        elif file_ext in ['.xlsx', '.xls']:
-            df = self.load_excel(input_path, sheet_name)
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: .csv, .xlsx, .xls")
+        print(f"\n🎉 Import completed successfully!")
+        print(f"📁 JSON file created: {output_path}")
+        print(f"🌐 You can now use this file with the interactive organigram")
         
-        # Process the data
-        self.process_dataframe(df)
+        return output_path, stats
+    
+    def import_files(self, input_paths, output_path=None, sheet_name=None, stream=False, workers=None,
+                     compact=False, compress=None, columnar=False, store=False, incremental=False, cache=None):
+        """Import several files in parallel and merge them into one hierarchy
         
-        # Create hierarchical structure
-        hierarchy = self.create_hierarchical_structure()
+        Each file is parsed in its own worker process. Node ids must be unique
+        across files (later duplicates are reported and dropped), while parent
+        ids may refer to nodes from any of the files.
+        """
+        input_paths = [Path(path) for path in input_paths]
+        for input_path in input_paths:
+            if not input_path.exists():
+                raise FileNotFoundError(f"Input file not found: {input_path}")
         
-        # Generate and display statistics
-        stats = self.generate_statistics(hierarchy)
-        self.display_statistics(stats)
+        if output_path is None:
+            output_path = input_paths[0].with_name("merged_hierarchy.json")
         
-        # Save JSON file
-        self.save_json(hierarchy, output_path)
+        print(f"🚀 Starting import of {len(input_paths)} files...")
+        print(f"📄 Output: {output_path}")
         
+        cache_key = None
+        outputs = self.output_roles(output_path, compress, columnar, store)
+        if cache is not None and not incremental:
+            options = {'importer': 'advanced', 'sheet': sheet_name, 'stream': stream,
+                       'compact': compact, 'compress': compress}
+            cache_key, stats = self.restore_from_cache(cache, input_paths, options, outputs)
+            if stats is not None:
+                return output_path, stats
+        
+        start = time.perf_counter()
+        jobs = [(str(input_path), sheet_name, stream) for input_path in input_paths]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load_file_in_worker, jobs))
+        parsed = time.perf_counter()
+        
+        # Merge in input order so the first definition of an id always wins
+        print("\n📂 Parsed files:")
+        ranges = []
+        for input_path, (model, log, elapsed) in zip(input_paths, results):
+            print(f"   📄 {input_path.name}: {len(model):,} nodes in {elapsed:.2f}s")
+            for line in log.splitlines():
+                if line.startswith('⚠️'):
+                    print(f"      {line}")
+            
+            first = len(self.model)
+            conflicts = self.model.merge(model)
+            ranges.append((input_path.name, first, len(self.model)))
+            if conflicts:
+                shown = ', '.join(conflicts[:5]) + (' ...' if len(conflicts) > 5 else '')
+                print(f"      ⚠️  {len(conflicts)} ids already defined by an earlier file (kept the first): {shown}")
+        
+        self.model.link()
+        parents = self.model.parents
+        cross_file = sum(1 for _, first, end in ranges
+                         for index in range(first, end)
+                         if parents[index] >= 0 and not first <= parents[index] < end)
+        print(f"\n🔗 Merged {len(self.model):,} nodes; {cross_file:,} parents resolved across files")
+        
+        stats = self.build_and_save(output_path, compact=compact, compress=compress, columnar=columnar, store=store,
+                                    incremental=incremental)
+        
+        total = time.perf_counter() - start
+        stats['timings'] = {
+            'files': {str(input_path): elapsed for input_path, (_, _, elapsed) in zip(input_paths, results)},
+            'parse': parsed - start,
+            'total': total
+        }
+        print(f"\n⏱️  Parsed {len(input_paths)} files in {parsed - start:.2f}s, total {total:.2f}s")
+        if cache_key:
+            self.save_to_cache(cache, cache_key, outputs, stats)
         print(f"\n🎉 Import completed successfully!")
         print(f"📁 JSON file created: {output_path}")
-        print(f"🌐 You can now use this file with the interactive organigram")
         
         return output_path, stats
     
+    def output_roles(self, output_path, compress=None, columnar=False, store=False):
+        """The files an import writes, keyed by their role in the import cache"""
+        outputs = {'json': str(output_path)}
+        if compress:
+            outputs[compress] = f"{output_path}{COMPRESSED_SUFFIXES[compress]}"
+        if columnar:
+            outputs['columnar'] = columnar_path(output_path)
+        if store:
+            outputs['store'] = store_path(output_path)
+        return outputs
+    
+    def restore_from_cache(self, cache, input_paths, options, outputs):
+        """Return (key, stats); stats is None unless the outputs were restored from the cache"""
+        start = time.perf_counter()
+        key = cache.key(input_paths, options)
+        stats = cache.lookup(key, outputs)
+        if stats is not None:
+            # The restored JSON is not the one the last incremental import described
+            discard_manifest(outputs['json'])
+            print(f"⚡ Input unchanged since a cached import: outputs restored in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+            self.display_statistics(stats)
+        return key, stats
+    
+    def save_to_cache(self, cache, key, outputs, stats):
+        """Store an import's outputs and statistics in the cache"""
+        try:
+            cache.store(key, outputs, stats)
+            print(f"🗃️  Cached in: {cache.cache_dir}")
+        except OSError as e:
+            print(f"⚠️  Could not cache the import: {str(e)}")
+    
     def display_statistics(self, stats):
         """Display import statistics"""
         print("\n📊 Import Statistics:")
         print("=" * 50)
         print(f"Total Nodes: {stats['total_nodes']:,}")
         print(f"Root Nodes: {stats['root_nodes']}")
+        print(f"Max Depth: {stats['max_depth']}")
         print(f"Max Children per Node: {stats['max_children']}")
+        fan_out = stats['fan_out']['percentiles']
+        if fan_out:
+            print(f"Children per Parent: median {fan_out['p50']}, p90 {fan_out['p90']}, p99 {fan_out['p99']}")
         
         print("\nLevel Distribution:")
         for level, count in sorted(stats['levels'].items()):
             print(f"  {level}: {count:,} nodes")
         
+        if stats['unreachable_nodes']:
+            print(f"\n⚠️  {stats['unreachable_nodes']:,} nodes are not reachable from a root node")
+        
         if stats['orphaned_nodes']:
             print(f"\n⚠️  Found {len(stats['orphaned_nodes'])} orphaned nodes:")
             for node in stats['orphaned_nodes'][:5]:  # Show first 5
@@ -269,6 +534,16 @@ class OrganigramImporter:
             if len(stats['orphaned_nodes']) > 5:
                 print(f"  ... and {len(stats['orphaned_nodes']) - 5} more")
 
+def load_file_in_worker(job):
+    """Process pool entry point: parse one file, returning (model, console output, seconds)"""
+    input_path, sheet_name, stream = job
+    importer = OrganigramImporter()
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        importer.load_file(input_path, sheet_name, stream)
+    return importer.model, output.getvalue(), time.perf_counter() - start
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import CSV or Excel files for Interactive Organigram",
@@ -278,6 +553,14 @@ Examples:
   python3 import_organigram.py data.csv
   python3 import_organigram.py data.xlsx -o custom_output.json
   python3 import_organigram.py data.xlsx -s "Sheet2"
+  python3 import_organigram.py huge.csv --stream
+  python3 import_organigram.py huge.xlsx -s "Parts" --stream
+  python3 import_organigram.py huge.csv --compact --compress gzip
+  python3 import_organigram.py huge.csv --columnar
+  python3 import_organigram.py huge.csv --store
+  python3 import_organigram.py brakes.csv chassis.csv body.xlsx -o merged.json
+  python3 import_organigram.py nodes.csv --incremental
+  python3 import_organigram.py nodes.csv --no-cache
   
 Required columns in input file:
   - name: Node name/description
@@ -287,10 +570,24 @@ Required columns in input file:
         """
     )
     
-    parser.add_argument('input_file', help='Path to CSV or Excel file')
+    parser.add_argument('input_files', nargs='+', metavar='input_file',
+                        help='Path to CSV or Excel file (several files are imported in parallel and merged)')
     parser.add_argument('-o', '--output', help='Output JSON file path (default: auto-generated)')
     parser.add_argument('-s', '--sheet', help='Excel sheet name (default: first sheet)')
     parser.add_argument('--validate-only', action='store_true', help='Only validate file structure without creating output')
+    parser.add_argument('--stream', action='store_true', help='Read CSV/.xlsx rows as they are parsed instead of loading a DataFrame (for very large files)')
+    parser.add_argument('--columnar', action='store_true', help='Also write the flat columnar format (<output>.columnar.json)')
+    parser.add_argument('--store', action='store_true', help='Also write a memory-mapped binary store (<output>.orgh)')
+    parser.add_argument('--compact', action='store_true', help='Write JSON without indentation (smaller output)')
+    parser.add_argument('--compress', choices=['gzip', 'brotli'], help='Also write a compressed copy (.gz or .br) next to the JSON file')
+    parser.add_argument('--workers', type=int, help='Worker processes for multi-file imports (default: CPU count)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Patch the previous output in place of a full rewrite and write a changeset (<output>.changes.json)')
+    parser.add_argument('--stats-json', help='Also write the import statistics as JSON to this path')
+    parser.add_argument('--no-cache', action='store_true', help='Always import, bypassing the import cache')
+    parser.add_argument('--cache-dir', help='Import cache directory (default: $ORGANIGRAM_CACHE_DIR or ~/.cache/organigram-import)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                        help='Import cache size limit in MB; least recently used entries are evicted (default: %(default)s)')
     
     args = parser.parse_args()
     
@@ -300,25 +597,53 @@ Required columns in input file:
         if args.validate_only:
             print("🔍 Validation mode - checking file structure only...")
             # Load and validate without saving
-            input_path = Path(args.input_file)
-            file_ext = input_path.suffix.lower()
+            for input_file in args.input_files:
+                input_path = Path(input_file)
+                file_ext = input_path.suffix.lower()
+                
+                if file_ext == '.csv':
+                    df = importer.load_csv(input_path)
+                elif file_ext in ['.xlsx', '.xls']:
+                    df = importer.load_excel(input_path, args.sheet)
+                else:
+                    raise ValueError(f"Unsupported file format: {file_ext}")
+                
+                importer.validate_columns(df)
+                print(f"✅ File structure is valid ({len(df)} rows)")
             
-            if file_ext == '.csv':
-                df = importer.load_csv(input_path)
-            elif file_ext in ['.xlsx', '.xls']:
-                df = importer.load_excel(input_path, args.sheet)
+        else:
+            cache = None if args.no_cache else ImportCache(args.cache_dir, args.cache_size * 1024 * 1024)
+            if len(args.input_files) > 1:
+                output_path, stats = importer.import_files(
+                    input_paths=args.input_files,
+                    output_path=args.output,
+                    sheet_name=args.sheet,
+                    stream=args.stream,
+                    workers=args.workers,
+                    compact=args.compact,
+                    compress=args.compress,
+                    columnar=args.columnar,
+                    store=args.store,
+                    incremental=args.incremental,
+                    cache=cache
+                )
             else:
-                raise ValueError(f"Unsupported file format: {file_ext}")
-            
-            importer.validate_columns(df)
-            print(f"✅ File structure is valid ({len(df)} rows)")
+                output_path, stats = importer.import_file(
+                    input_path=args.input_files[0],
+                    output_path=args.output,
+                    sheet_name=args.sheet,
+                    stream=args.stream,
+                    compact=args.compact,
+                    compress=args.compress,
+                    columnar=args.columnar,
+                    store=args.store,
+                    incremental=args.incremental,
+                    cache=cache
+                )
             
-        else:
-            output_path, stats = importer.import_file(
-                input_path=args.input_file,
-                output_path=args.output,
-                sheet_name=args.sheet
-            )
+            if args.stats_json:
+                save_statistics(stats, args.stats_json)
+                print(f"📊 Statistics saved: {args.stats_json}")
             
             print(f"\n🌐 To use with the organigram:")
             print(f"   1. Copy {output_path} to your organigram directory")
@@ -6,17 +6,26 @@ For Excel support, use import_organigram_advanced.py
 """
 
 import csv
-import json
 import argparse
-import os
+import contextlib
+import io
 import sys
-from collections import defaultdict
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from hierarchy_model import HierarchyModel
+from encoding_detection import detect_encoding
+from hierarchy_columnar import columnar_path, write_columnar
+from hierarchy_stats import hierarchy_statistics, save_statistics
+from hierarchy_store import store_path, write_store
+from hierarchy_writer import COMPRESSED_SUFFIXES, peak_rss_bytes, save_hierarchy_json
+from import_cache import DEFAULT_CACHE_SIZE, ImportCache
+from incremental_import import discard_manifest, save_incremental
+
 class SimpleOrganigramImporter:
     def __init__(self):
-        self.nodes = {}
-        self.children_map = defaultdict(list)
+        self.model = HierarchyModel()
         self.required_columns = ['name', 'id', 'pid', 'level']
         
     def clean_field(self, field):
@@ -29,23 +38,18 @@ class SimpleOrganigramImporter:
         """Load data from CSV file"""
         print(f"📁 Loading CSV file: {file_path}")
         
-        rows = []
-        encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding, newline='') as file:
-                    csv_reader = csv.DictReader(file)
-                    rows = list(csv_reader)
-                    print(f"✅ Successfully loaded with {encoding} encoding")
-                    break
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                raise ValueError(f"Error reading CSV file: {str(e)}")
+        # Detect the encoding once so the file is parsed a single time
+        encoding = detect_encoding(file_path)
+        try:
+            with open(file_path, 'r', encoding=encoding, newline='') as file:
+                csv_reader = csv.DictReader(file)
+                rows = list(csv_reader)
+                print(f"✅ Successfully loaded with {encoding} encoding")
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {str(e)}")
         
         if not rows:
-            raise ValueError("Could not read CSV file with any supported encoding")
+            raise ValueError("CSV file is empty")
         
         return rows
     
@@ -92,23 +96,13 @@ class SimpleOrganigramImporter:
                     continue
                 
                 # Check for duplicate IDs
-                if node_id in self.nodes:
+                if node_id in self.model:
                     print(f"⚠️  Duplicate ID found: {node_id} (row {index + 1})")
                     skipped_count += 1
                     continue
                 
                 # Store node information
-                self.nodes[node_id] = {
-                    'id': node_id,
-                    'name': name,
-                    'pid': pid,
-                    'level': level if level else 'unknown',
-                    'children': []
-                }
-                
-                # Build parent-child relationships
-                if pid and pid != 'NULL':
-                    self.children_map[pid].append(node_id)
+                self.model.add(node_id, name, pid, level if level else 'unknown')
                 
                 processed_count += 1
                     
@@ -117,10 +111,8 @@ class SimpleOrganigramImporter:
                 skipped_count += 1
                 continue
         
-        # Add children to each node
-        for parent_id, child_ids in self.children_map.items():
-            if parent_id in self.nodes:
-                self.nodes[parent_id]['children'] = child_ids
+        # Link parents and children by index
+        self.model.link()
         
         print(f"✅ Processed {processed_count} nodes successfully")
         if skipped_count > 0:
@@ -130,88 +122,112 @@ class SimpleOrganigramImporter:
         """Create the hierarchical JSON structure"""
         print("🌳 Building hierarchical structure...")
         
-        # Find root nodes (those with no parent or NULL parent)
-        root_nodes = []
+        # Root nodes are those with no parent or NULL parent
+        root_nodes, report = self.model.build_hierarchy()
         
-        for node_id, node in self.nodes.items():
-            if node['pid'] is None:
-                root_nodes.append(self.build_tree(node_id))
+        for cycle in report['cycles']:
+            print(f"⚠️  Parent cycle left out of the hierarchy: {' -> '.join(cycle + cycle[:1])}")
         
         print(f"🌲 Found {len(root_nodes)} root nodes")
         return root_nodes
     
-    def build_tree(self, node_id):
-        """Recursively build tree structure"""
-        if node_id not in self.nodes:
-            return None
-        
-        node = self.nodes[node_id].copy()
-        node['children'] = []
-        
-        for child_id in self.nodes[node_id]['children']:
-            child_tree = self.build_tree(child_id)
-            if child_tree:
-                node['children'].append(child_tree)
-        
-        return node
-    
     def generate_statistics(self, hierarchy):
-        """Generate statistics about the imported data"""
-        stats = {
-            'total_nodes': len(self.nodes),
-            'root_nodes': len(hierarchy),
-            'levels': defaultdict(int),
-            'max_children': 0,
-            'orphaned_nodes': [],
-            'max_depth': 0
-        }
+        """Generate statistics about the imported data (see hierarchy_stats.py)"""
+        return hierarchy_statistics(self.model)
+    
+    def save_json(self, hierarchy, output_path, compact=False, compress=None):
+        """Stream the hierarchical structure to a JSON file"""
+        print(f"💾 Saving to: {output_path}")
         
-        # Count nodes by level and find max children
-        for node in self.nodes.values():
-            if node['level']:
-                stats['levels'][node['level']] += 1
+        try:
+            result = save_hierarchy_json(hierarchy, output_path, compact=compact, compress=compress)
+            print(f"✅ JSON file saved successfully ({result['bytes_written']:,} bytes)")
+            if compress:
+                print(f"🗜️  Compressed copy: {result['compressed_path']} ({result['compressed_bytes']:,} bytes)")
             
-            children_count = len(node['children'])
-            if children_count > stats['max_children']:
-                stats['max_children'] = children_count
+            peak_rss = peak_rss_bytes()
+            if peak_rss:
+                print(f"📈 Peak memory (RSS): {peak_rss / 1024 / 1024:,.1f} MB")
             
-            # Check for orphaned nodes (have parent ID but parent doesn't exist)
-            if node['pid'] and node['pid'] not in self.nodes:
-                stats['orphaned_nodes'].append({
-                    'id': node['id'],
-                    'name': node['name'],
-                    'missing_parent': node['pid']
-                })
-        
-        # Calculate max depth
-        def calculate_depth(node_list, depth=0):
-            max_d = depth
-            for node in node_list:
-                if node.get('children'):
-                    child_depth = calculate_depth(node['children'], depth + 1)
-                    max_d = max(max_d, child_depth)
-            return max_d
-        
-        stats['max_depth'] = calculate_depth(hierarchy)
+        except Exception as e:
+            raise ValueError(f"Error saving JSON file: {str(e)}")
+    
+    def save_json_incremental(self, hierarchy, output_path, compact=False, compress=None):
+        """Save the JSON file, re-serializing only what changed since the previous import"""
+        print(f"💾 Updating: {output_path}")
         
-        return stats
+        try:
+            result = save_incremental(self.model, hierarchy, output_path, compact=compact, compress=compress)
+        except Exception as e:
+            raise ValueError(f"Error saving JSON file: {str(e)}")
+        
+        if result['mode'] == 'full':
+            print(f"ℹ️  Full write: {result['reason']}")
+            print(f"✅ JSON file saved successfully ({result['bytes_written']:,} bytes, manifest written)")
+        else:
+            counts = ', '.join(f"{len(entries)} {kind}" for kind, entries in result['changes'].items())
+            print(f"🔁 Changes since the previous import: {counts}")
+            if result['mode'] == 'unchanged':
+                print(f"✅ JSON file is up to date ({result['bytes_written']:,} bytes)")
+            else:
+                print(f"✅ JSON file patched ({result['bytes_written']:,} bytes): "
+                      f"{result['rewritten']:,} nodes rewritten, {result['copied']:,} subtrees copied")
+            print(f"📝 Changeset: {result['changes_path']}")
+        if compress:
+            print(f"🗜️  Compressed copy: {result['compressed_path']} ({result['compressed_bytes']:,} bytes)")
+        return result
     
-    def save_json(self, hierarchy, output_path):
-        """Save the hierarchical structure to JSON file"""
-        print(f"💾 Saving to: {output_path}")
+    def save_columnar(self, hierarchy, output_path):
+        """Save the hierarchy in the flat columnar format"""
+        print(f"💾 Saving columnar file to: {output_path}")
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(hierarchy, f, indent=2, ensure_ascii=False)
+            file_size = write_columnar(hierarchy, output_path)
+            print(f"✅ Columnar file saved successfully ({file_size:,} bytes)")
             
-            file_size = os.path.getsize(output_path)
-            print(f"✅ JSON file saved successfully ({file_size:,} bytes)")
+        except Exception as e:
+            raise ValueError(f"Error saving columnar file: {str(e)}")
+    
+    def save_store(self, hierarchy, output_path):
+        """Save the hierarchy as a memory-mapped binary store"""
+        print(f"💾 Saving hierarchy store to: {output_path}")
+        
+        try:
+            file_size = write_store(hierarchy, output_path)
+            print(f"✅ Hierarchy store saved successfully ({file_size:,} bytes)")
             
         except Exception as e:
-            raise ValueError(f"Error saving JSON file: {str(e)}")
+            raise ValueError(f"Error saving hierarchy store: {str(e)}")
     
-    def import_csv(self, input_path, output_path=None):
-        """Main import function for CSV files"""
+    def build_and_save(self, output_path, compact=False, compress=None, columnar=False, store=False, incremental=False):
+        """Build the hierarchy from the loaded nodes, report statistics and write the outputs"""
+        # Create hierarchical structure
+        hierarchy = self.create_hierarchical_structure()
+        
+        # Generate and display statistics
+        stats = self.generate_statistics(hierarchy)
+        self.display_statistics(stats)
+        
+        # Save JSON file
+        if incremental:
+            self.save_json_incremental(hierarchy, output_path, compact=compact, compress=compress)
+        else:
+            self.save_json(hierarchy, output_path, compact=compact, compress=compress)
+        if columnar:
+            self.save_columnar(hierarchy, columnar_path(output_path))
+        if store:
+            self.save_store(hierarchy, store_path(output_path))
+        
+        return stats
+    
+    def import_csv(self, input_path, output_path=None, compact=False, compress=None, columnar=False, store=False,
+                   incremental=False, cache=None):
+        """Main import function for CSV files
+        
+        With an ImportCache, an input identical to a cached import (same bytes
+        and options) restores the cached outputs instead of importing again.
+        Incremental imports bypass the cache.
+        """
         input_path = Path(input_path)
         
         if not input_path.exists():
@@ -228,26 +244,135 @@ class SimpleOrganigramImporter:
         print(f"📄 Input: {input_path}")
         print(f"📄 Output: {output_path}")
         
+        cache_key = None
+        outputs = self.output_roles(output_path, compress, columnar, store)
+        if cache is not None and not incremental:
+            options = {'importer': 'simple', 'compact': compact, 'compress': compress}
+            cache_key, stats = self.restore_from_cache(cache, [input_path], options, outputs)
+            if stats is not None:
+                return output_path, stats
+        
         # Load and process CSV
         rows = self.load_csv(input_path)
         self.process_rows(rows)
         
-        # Create hierarchical structure
-        hierarchy = self.create_hierarchical_structure()
+        stats = self.build_and_save(output_path, compact=compact, compress=compress, columnar=columnar, store=store,
+                                    incremental=incremental)
+        if cache_key:
+            self.save_to_cache(cache, cache_key, outputs, stats)
         
-        # Generate and display statistics
-        stats = self.generate_statistics(hierarchy)
-        self.display_statistics(stats)
+        print(f"\n🎉 Import completed successfully!")
+        print(f"📁 JSON file created: {output_path}")
+        print(f"🌐 You can now use this file with the interactive organigram")
         
-        # Save JSON file
-        self.save_json(hierarchy, output_path)
+        return output_path, stats
+    
+    def import_csv_files(self, input_paths, output_path=None, workers=None,
+                         compact=False, compress=None, columnar=False, store=False, incremental=False, cache=None):
+        """Import several CSV files in parallel and merge them into one hierarchy
         
+        Each file is parsed in its own worker process. Node ids must be unique
+        across files (later duplicates are reported and dropped), while parent
+        ids may refer to nodes from any of the files.
+        """
+        input_paths = [Path(path) for path in input_paths]
+        for input_path in input_paths:
+            if not input_path.exists():
+                raise FileNotFoundError(f"Input file not found: {input_path}")
+            if input_path.suffix.lower() != '.csv':
+                raise ValueError(f"This tool only supports CSV files. For Excel files, use import_organigram_advanced.py")
+        
+        if output_path is None:
+            output_path = input_paths[0].with_name("merged_hierarchy.json")
+        
+        print(f"🚀 Starting CSV import of {len(input_paths)} files...")
+        print(f"📄 Output: {output_path}")
+        
+        cache_key = None
+        outputs = self.output_roles(output_path, compress, columnar, store)
+        if cache is not None and not incremental:
+            options = {'importer': 'simple', 'compact': compact, 'compress': compress}
+            cache_key, stats = self.restore_from_cache(cache, input_paths, options, outputs)
+            if stats is not None:
+                return output_path, stats
+        
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load_csv_in_worker, [str(input_path) for input_path in input_paths]))
+        parsed = time.perf_counter()
+        
+        # Merge in input order so the first definition of an id always wins
+        print("\n📂 Parsed files:")
+        ranges = []
+        for input_path, (model, log, elapsed) in zip(input_paths, results):
+            print(f"   📄 {input_path.name}: {len(model):,} nodes in {elapsed:.2f}s")
+            for line in log.splitlines():
+                if line.startswith('⚠️'):
+                    print(f"      {line}")
+            
+            first = len(self.model)
+            conflicts = self.model.merge(model)
+            ranges.append((input_path.name, first, len(self.model)))
+            if conflicts:
+                shown = ', '.join(conflicts[:5]) + (' ...' if len(conflicts) > 5 else '')
+                print(f"      ⚠️  {len(conflicts)} ids already defined by an earlier file (kept the first): {shown}")
+        
+        self.model.link()
+        parents = self.model.parents
+        cross_file = sum(1 for _, first, end in ranges
+                         for index in range(first, end)
+                         if parents[index] >= 0 and not first <= parents[index] < end)
+        print(f"\n🔗 Merged {len(self.model):,} nodes; {cross_file:,} parents resolved across files")
+        
+        stats = self.build_and_save(output_path, compact=compact, compress=compress, columnar=columnar, store=store,
+                                    incremental=incremental)
+        
+        total = time.perf_counter() - start
+        stats['timings'] = {
+            'files': {str(input_path): elapsed for input_path, (_, _, elapsed) in zip(input_paths, results)},
+            'parse': parsed - start,
+            'total': total
+        }
+        print(f"\n⏱️  Parsed {len(input_paths)} files in {parsed - start:.2f}s, total {total:.2f}s")
+        if cache_key:
+            self.save_to_cache(cache, cache_key, outputs, stats)
         print(f"\n🎉 Import completed successfully!")
         print(f"📁 JSON file created: {output_path}")
-        print(f"🌐 You can now use this file with the interactive organigram")
         
         return output_path, stats
     
+    def output_roles(self, output_path, compress=None, columnar=False, store=False):
+        """The files an import writes, keyed by their role in the import cache"""
+        outputs = {'json': str(output_path)}
+        if compress:
+            outputs[compress] = f"{output_path}{COMPRESSED_SUFFIXES[compress]}"
+        if columnar:
+            outputs['columnar'] = columnar_path(output_path)
+        if store:
+            outputs['store'] = store_path(output_path)
+        return outputs
+    
+    def restore_from_cache(self, cache, input_paths, options, outputs):
+        """Return (key, stats); stats is None unless the outputs were restored from the cache"""
+        start = time.perf_counter()
+        key = cache.key(input_paths, options)
+        stats = cache.lookup(key, outputs)
+        if stats is not None:
+            # The restored JSON is not the one the last incremental import described
+            discard_manifest(outputs['json'])
+            print(f"⚡ Input unchanged since a cached import: outputs restored in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+            self.display_statistics(stats)
+        return key, stats
+    
+    def save_to_cache(self, cache, key, outputs, stats):
+        """Store an import's outputs and statistics in the cache"""
+        try:
+            cache.store(key, outputs, stats)
+            print(f"🗃️  Cached in: {cache.cache_dir}")
+        except OSError as e:
+            print(f"⚠️  Could not cache the import: {str(e)}")
+    
     def display_statistics(self, stats):
         """Display import statistics"""
         print("\n📊 Import Statistics:")
@@ -256,11 +381,17 @@ class SimpleOrganigramImporter:
         print(f"Root Nodes: {stats['root_nodes']}")
         print(f"Max Depth: {stats['max_depth']}")
         print(f"Max Children per Node: {stats['max_children']}")
+        fan_out = stats['fan_out']['percentiles']
+        if fan_out:
+            print(f"Children per Parent: median {fan_out['p50']}, p90 {fan_out['p90']}, p99 {fan_out['p99']}")
         
         print("\nLevel Distribution:")
         for level, count in sorted(stats['levels'].items()):
             print(f"  {level}: {count:,} nodes")
         
+        if stats['unreachable_nodes']:
+            print(f"\n⚠️  {stats['unreachable_nodes']:,} nodes are not reachable from a root node")
+        
         if stats['orphaned_nodes']:
             print(f"\n⚠️  Found {len(stats['orphaned_nodes'])} orphaned nodes:")
             for node in stats['orphaned_nodes'][:5]:  # Show first 5
@@ -268,6 +399,15 @@ class SimpleOrganigramImporter:
             if len(stats['orphaned_nodes']) > 5:
                 print(f"  ... and {len(stats['orphaned_nodes']) - 5} more")
 
+def load_csv_in_worker(input_path):
+    """Process pool entry point: parse one CSV file, returning (model, console output, seconds)"""
+    importer = SimpleOrganigramImporter()
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        importer.process_rows(importer.load_csv(input_path))
+    return importer.model, output.getvalue(), time.perf_counter() - start
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import CSV files for Interactive Organigram (Built-in libraries only)",
@@ -277,6 +417,12 @@ Examples:
   python3 import_organigram_simple.py data.csv
   python3 import_organigram_simple.py data.csv -o custom_output.json
   python3 import_organigram_simple.py data.csv --validate-only
+  python3 import_organigram_simple.py data.csv --compact --compress gzip
+  python3 import_organigram_simple.py data.csv --columnar
+  python3 import_organigram_simple.py data.csv --store
+  python3 import_organigram_simple.py brakes.csv chassis.csv body.csv -o merged.json
+  python3 import_organigram_simple.py nodes.csv --incremental
+  python3 import_organigram_simple.py nodes.csv --no-cache
   
 Required columns in CSV file:
   - name: Node name/description
@@ -288,9 +434,22 @@ Note: For Excel file support, use import_organigram_advanced.py
         """
     )
     
-    parser.add_argument('input_file', help='Path to CSV file')
+    parser.add_argument('input_files', nargs='+', metavar='input_file',
+                        help='Path to CSV file (several files are imported in parallel and merged)')
     parser.add_argument('-o', '--output', help='Output JSON file path (default: auto-generated)')
     parser.add_argument('--validate-only', action='store_true', help='Only validate file structure without creating output')
+    parser.add_argument('--columnar', action='store_true', help='Also write the flat columnar format (<output>.columnar.json)')
+    parser.add_argument('--store', action='store_true', help='Also write a memory-mapped binary store (<output>.orgh)')
+    parser.add_argument('--compact', action='store_true', help='Write JSON without indentation (smaller output)')
+    parser.add_argument('--compress', choices=['gzip'], help='Also write a gzip-compressed copy (.gz) next to the JSON file')
+    parser.add_argument('--workers', type=int, help='Worker processes for multi-file imports (default: CPU count)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Patch the previous output in place of a full rewrite and write a changeset (<output>.changes.json)')
+    parser.add_argument('--stats-json', help='Also write the import statistics as JSON to this path')
+    parser.add_argument('--no-cache', action='store_true', help='Always import, bypassing the import cache')
+    parser.add_argument('--cache-dir', help='Import cache directory (default: $ORGANIGRAM_CACHE_DIR or ~/.cache/organigram-import)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                        help='Import cache size limit in MB; least recently used entries are evicted (default: %(default)s)')
     
     args = parser.parse_args()
     
@@ -299,15 +458,40 @@ Note: For Excel file support, use import_organigram_advanced.py
         
         if args.validate_only:
             print("🔍 Validation mode - checking file structure only...")
-            rows = importer.load_csv(args.input_file)
-            importer.validate_columns(rows)
-            print(f"✅ File structure is valid ({len(rows)} rows)")
+            for input_file in args.input_files:
+                rows = importer.load_csv(input_file)
+                importer.validate_columns(rows)
+                print(f"✅ File structure is valid ({len(rows)} rows)")
             
         else:
-            output_path, stats = importer.import_csv(
-                input_path=args.input_file,
-                output_path=args.output
-            )
+            cache = None if args.no_cache else ImportCache(args.cache_dir, args.cache_size * 1024 * 1024)
+            if len(args.input_files) > 1:
+                output_path, stats = importer.import_csv_files(
+                    input_paths=args.input_files,
+                    output_path=args.output,
+                    workers=args.workers,
+                    compact=args.compact,
+                    compress=args.compress,
+                    columnar=args.columnar,
+                    store=args.store,
+                    incremental=args.incremental,
+                    cache=cache
+                )
+            else:
+                output_path, stats = importer.import_csv(
+                    input_path=args.input_files[0],
+                    output_path=args.output,
+                    compact=args.compact,
+                    compress=args.compress,
+                    columnar=args.columnar,
+                    store=args.store,
+                    incremental=args.incremental,
+                    cache=cache
+                )
+            
+            if args.stats_json:
+                save_statistics(stats, args.stats_json)
+                print(f"📊 Statistics saved: {args.stats_json}")
             
             print(f"\n🌐 To use with the organigram:")
             print(f"   1. Copy {output_path} to your organigram directory")
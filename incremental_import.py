@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Incremental re-import for organigram hierarchies
+Diffs a freshly loaded node model against the manifest left by the previous
+import and re-serializes only the subtrees that changed; every untouched
+subtree is copied as text straight from the previous JSON output
+"""
+
+import hashlib
+import json
+import os
+from itertools import compress
+from operator import ne
+
+from hierarchy_writer import save_compressed_copy, save_hierarchy_json
+
+MANIFEST_FORMAT = 'organigram-manifest'
+MANIFEST_VERSION = 2
+CHANGES_FORMAT = 'organigram-changes'
+CHANGES_VERSION = 1
+
+CHANGE_KINDS = ('added', 'removed', 'renamed', 'reparented', 'relevelled')
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def name_hashes(names):
+    """64-bit BLAKE2b digests of node names, as stored in the manifest"""
+    return [hashlib.blake2b(name.encode('utf-8'), digest_size=8).hexdigest() for name in names]
+
+
+def output_digest(output_path):
+    """BLAKE2b digest of an output file's bytes, as stored in the manifest"""
+    digest = hashlib.blake2b()
+    with open(output_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sidecar_path(output_path, suffix):
+    output_path = str(output_path)
+    stem = output_path[:-5] if output_path.endswith('.json') else output_path
+    return f"{stem}{suffix}"
+
+
+def manifest_path(output_path):
+    """Path of the row manifest written next to a nested JSON output"""
+    return sidecar_path(output_path, '.manifest.json')
+
+
+def changes_path(output_path):
+    """Path of the changeset written next to a nested JSON output"""
+    return sidecar_path(output_path, '.changes.json')
+
+
+def discard_manifest(output_path):
+    """Delete the manifest of an output replaced by something other than save_incremental"""
+    try:
+        os.remove(manifest_path(output_path))
+    except FileNotFoundError:
+        pass
+
+
+def load_manifest(output_path, compact=False):
+    """Return (manifest, None), or (None, reason) if the previous import can't be patched"""
+    path = manifest_path(output_path)
+    if not os.path.exists(path) or not os.path.exists(output_path):
+        return None, "no manifest from a previous import"
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != MANIFEST_FORMAT or manifest.get('version') != MANIFEST_VERSION:
+        return None, f"{path} is not a {MANIFEST_FORMAT} v{MANIFEST_VERSION} file"
+    if manifest['compact'] != compact:
+        return None, "the previous output used a different JSON layout"
+    if (manifest['output_size'] != os.path.getsize(output_path)
+            or manifest['output_digest'] != output_digest(output_path)):
+        return None, f"{output_path} changed since the manifest was written"
+    return manifest, None
+
+
+def write_manifest(model, hashes, starts, lengths, output_path, compact, output_size):
+    """Write the manifest for the output just written, returning its path
+
+    The manifest records the output's size and digest, so any later write
+    to it is noticed. It is columnar, aligned with the model's rows: id, name
+    hash, parent id and level, plus where the node's object sits in the
+    output: its start relative to its parent's start (absolute for roots)
+    and its length, in characters. Relative starts stay valid when a whole
+    subtree is copied to a new place.
+    """
+    # json.dumps uses the C encoder; json.dump to a file would not
+    text = json.dumps({
+        'format': MANIFEST_FORMAT,
+        'version': MANIFEST_VERSION,
+        'compact': compact,
+        'output_size': output_size,
+        'output_digest': output_digest(output_path),
+        'ids': model.ids,
+        'name_hashes': hashes,
+        'pids': model.pids,
+        'levels': [model.levels[code] for code in model.level_codes],
+        'starts': starts,
+        'lengths': lengths,
+    }, ensure_ascii=False, separators=(',', ':'))
+    path = manifest_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def relative_spans(model, spans, starts, lengths):
+    """Store writer spans (absolute [start, end, depth] by id) as manifest starts and lengths"""
+    index, pids = model.index, model.pids
+    for node_id, (start, end, _) in spans.items():
+        position = index[node_id]
+        pid = pids[position]
+        starts[position] = start if pid is None else start - spans[pid][0]
+        lengths[position] = end - start
+
+
+class PreviousOutput:
+    """Where each node of the previous import sits in its JSON output"""
+
+    def __init__(self, manifest, old_index):
+        self.ids = manifest['ids']
+        self.pids = manifest['pids']
+        self.starts = manifest['starts']
+        self.lengths = manifest['lengths']
+        self.old_index = old_index
+        self._resolved = {}
+
+    def locate(self, position):
+        """(absolute start, depth) of a previous node, or None if it wasn't in the output
+
+        A node was written iff its parent chain reaches a root, in which case
+        its depth follows from the chain's length.
+        """
+        resolved = self._resolved
+        chain = []
+        on_chain = set()
+        while position not in resolved:
+            pid = self.pids[position]
+            if pid is None:
+                resolved[position] = (self.starts[position], 1)
+                break
+            chain.append(position)
+            on_chain.add(position)
+            position = self.old_index.get(pid)
+            if position is None or position in on_chain:
+                # A missing parent or a parent cycle: none of these were written
+                for node in chain:
+                    resolved[node] = None
+                return None
+
+        location = resolved[position]
+        for node in reversed(chain):
+            if location is not None:
+                location = (location[0] + self.starts[node], location[1] + 2)
+            resolved[node] = location
+        return location
+
+
+def diff_model(model, manifest, old_index, hashes):
+    """Compare a linked model with the previous import's manifest
+
+    Returns (changes, dirty): the changeset lists and the set of model
+    indexes whose subtree text must be regenerated, i.e. every changed node
+    and its ancestors plus the old parents nodes moved or were removed from.
+    """
+    changes = {kind: [] for kind in CHANGE_KINDS}
+    dirty = set()
+    parents = model.parents
+    old_ids, old_hashes, old_pids, old_levels = (manifest['ids'], manifest['name_hashes'],
+                                                 manifest['pids'], manifest['levels'])
+    levels = [model.levels[code] for code in model.level_codes]
+
+    def mark(index):
+        while index >= 0 and index not in dirty:
+            dirty.add(index)
+            index = parents[index]
+
+    def mark_id(node_id):
+        index = model.index.get(node_id)
+        if index is not None:
+            mark(index)
+
+    if old_ids == model.ids:
+        # Same rows in the same order: compare the columns position by position
+        candidates = set()
+        for old, new in ((old_hashes, hashes), (old_pids, model.pids), (old_levels, levels)):
+            if old != new:
+                candidates.update(compress(range(len(new)), map(ne, old, new)))
+        pairs = [(index, index) for index in sorted(candidates)]
+    else:
+        pairs = []
+        for index, node_id in enumerate(model.ids):
+            old = old_index.get(node_id)
+            if old is None:
+                changes['added'].append({'id': node_id, 'name': model.names[index],
+                                         'pid': model.pids[index], 'level': levels[index]})
+                mark(index)
+            elif (old_hashes[old] != hashes[index] or old_pids[old] != model.pids[index]
+                  or old_levels[old] != levels[index]):
+                pairs.append((index, old))
+        for old, node_id in enumerate(old_ids):
+            if node_id not in model.index:
+                changes['removed'].append({'id': node_id, 'pid': old_pids[old]})
+                mark_id(old_pids[old])
+
+    for index, old in pairs:
+        node_id = model.ids[index]
+        if old_hashes[old] != hashes[index]:
+            changes['renamed'].append({'id': node_id, 'name': model.names[index]})
+        if old_pids[old] != model.pids[index]:
+            changes['reparented'].append({'id': node_id, 'old_pid': old_pids[old], 'pid': model.pids[index]})
+            mark_id(old_pids[old])
+        if old_levels[old] != levels[index]:
+            changes['relevelled'].append({'id': node_id, 'old_level': old_levels[old], 'level': levels[index]})
+        mark(index)
+
+    return changes, dirty
+
+
+def write_changes(changes, output_path):
+    """Write a changeset next to the output, returning its path"""
+    path = changes_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'format': CHANGES_FORMAT,
+            'version': CHANGES_VERSION,
+            'output': str(output_path),
+            'counts': {kind: len(changes[kind]) for kind in CHANGE_KINDS},
+            **changes,
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def save_incremental(model, root_nodes, output_path, compact=False, compress=None):
+    """Write the hierarchy of a linked model, patching the previous output if possible
+
+    With a usable manifest from the previous import, only nodes whose rows
+    changed (and their ancestors) are serialized again; untouched subtrees
+    are copied from the previous file. Otherwise the whole hierarchy is
+    written. Either way a fresh manifest is left for the next run.
+
+    Returns save_hierarchy_json's result plus 'mode' ('full', 'patched' or
+    'unchanged'), 'reason' (why a full write was needed), 'changes' and
+    'changes_path' (the changeset, None after a full write), and the number
+    of 'rewritten' nodes and 'copied' subtrees.
+    """
+    hashes = name_hashes(model.names)
+    manifest, reason = load_manifest(output_path, compact)
+    if manifest is not None:
+        old_ids = manifest['ids']
+        if old_ids == model.ids:
+            old_index = model.index
+        else:
+            old_index = dict(zip(old_ids, range(len(old_ids))))
+            # Children are written in row order, so shared rows must keep their order
+            if ([node_id for node_id in old_ids if node_id in model.index]
+                    != [node_id for node_id in model.ids if node_id in old_index]):
+                manifest, reason = None, "rows were reordered since the previous import"
+
+    if manifest is None:
+        spans = {}
+        result = save_hierarchy_json(root_nodes, output_path, compact=compact, compress=compress, spans=spans)
+        starts = [-1] * len(model)
+        lengths = [-1] * len(model)
+        relative_spans(model, spans, starts, lengths)
+        write_manifest(model, hashes, starts, lengths, output_path, compact, result['bytes_written'])
+        result.update(mode='full', reason=reason, changes=None, changes_path=None,
+                      rewritten=len(spans), copied=0)
+        return result
+
+    changes, dirty = diff_model(model, manifest, old_index, hashes)
+    if not any(changes.values()):
+        result = {'bytes_written': os.path.getsize(output_path)}
+        if compress:
+            # The output is kept, but its compressed copy may be missing or older
+            result.update(save_compressed_copy(output_path, compress))
+        result.update(mode='unchanged', reason=None, changes=changes,
+                      changes_path=write_changes(changes, output_path), rewritten=0, copied=0)
+        return result
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        previous_text = f.read()
+    previous = PreviousOutput(manifest, old_index)
+    index = model.index
+    copied = []
+
+    def verbatim(node, depth):
+        node_id = node['id']
+        if index[node_id] in dirty:
+            return None
+        old = old_index.get(node_id)
+        location = None if old is None else previous.locate(old)
+        if location is None or location[1] != depth:
+            return None
+        copied.append(node_id)
+        return previous_text[location[0]:location[0] + previous.lengths[old]]
+
+    spans = {}
+    result = save_hierarchy_json(root_nodes, output_path, compact=compact, compress=compress,
+                                 spans=spans, verbatim=verbatim)
+
+    # Rows kept from the previous import keep their spans, which stay valid
+    # inside copied subtrees; everything written or copied here gets new ones
+    if old_index is index:
+        starts = list(manifest['starts'])
+        lengths = list(manifest['lengths'])
+    else:
+        old_starts, old_lengths = manifest['starts'], manifest['lengths']
+        previous_rows = [old_index.get(node_id) for node_id in model.ids]
+        starts = [-1 if old is None else old_starts[old] for old in previous_rows]
+        lengths = [-1 if old is None else old_lengths[old] for old in previous_rows]
+    relative_spans(model, spans, starts, lengths)
+    write_manifest(model, hashes, starts, lengths, output_path, compact, result['bytes_written'])
+
+    result.update(mode='patched', reason=None, changes=changes,
+                  changes_path=write_changes(changes, output_path),
+                  rewritten=len(spans) - len(copied), copied=len(copied))
+    return result
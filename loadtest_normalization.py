@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Load test for the Intelligent Label Normalization Service
+Posts catalog labels to /normalize-text at increasing concurrency and reports
+throughput and p50/p99 latency for each level
+"""
+
+import argparse
+import csv
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def load_labels(csv_path, column='name'):
+    """Read one column of labels from a catalog CSV"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        return [row[column] for row in csv.DictReader(file) if row.get(column)]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_client(url, labels, offset, deadline, latencies, errors):
+    """Send requests over one keep-alive connection until the deadline"""
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+    headers = {'Content-Type': 'application/json'}
+    index = offset
+
+    while time.perf_counter() < deadline:
+        body = json.dumps({'text': labels[index % len(labels)]})
+        index += 1
+        start = time.perf_counter()
+        try:
+            connection.request('POST', target.path or '/normalize-text', body, headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+
+    connection.close()
+
+
+def run_level(url, labels, concurrency, duration):
+    """Run `concurrency` clients for `duration` seconds and summarize"""
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(url, labels, i * 997, deadline, latencies, errors))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /normalize-text endpoint")
+    parser.add_argument('--url', default='http://127.0.0.1:5000/normalize-text', help='Endpoint to load')
+    parser.add_argument('--csv', default='nodes.csv', help='Catalog CSV to read labels from (default: nodes.csv)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                        help='Concurrent clients per level')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per concurrency level')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+    labels = load_labels(args.csv)
+
+    results = []
+    if not args.json:
+        print(f"🚀 Load testing {args.url} with {len(labels):,} labels")
+        print(f"{'clients':>8}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50':>10}{'p99':>10}")
+    for concurrency in args.concurrency:
+        result = run_level(args.url, labels, concurrency, args.duration)
+        results.append(result)
+        if not args.json:
+            print(f"{result['concurrency']:>8}{result['requests']:>10,}{result['errors']:>8}"
+                  f"{result['rps']:>10,.0f}{result['p50_ms']:>8.2f}ms{result['p99_ms']:>8.2f}ms")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
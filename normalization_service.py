@@ -4,74 +4,358 @@ Intelligent Label Normalization Service
 Provides smart text normalization that preserves technical acronyms and abbreviations.
 """
 
+import os
 import re
 import json
-from flask import Flask, request, jsonify
+import codecs
+import atexit
+import asyncio
+import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask, Response, abort, request, jsonify, stream_with_context
 from flask_cors import CORS
+import spellchecker
 from spellchecker import SpellChecker
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8000", "http://127.0.0.1:8000", "file://"])  # Allow specific origins
 
-class IntelligentNormalizer:
-    def __init__(self):
-        self.spell = SpellChecker()
-        
-        # Common technical acronyms and abbreviations that should be preserved
-        self.technical_terms = {
-            # Electronics/Computing
-            'ABS', 'AC', 'DC', 'LED', 'LCD', 'OLED', 'RAM', 'ROM', 'CPU', 'GPU', 'SSD', 'HDD',
-            'USB', 'HDMI', 'VGA', 'DVI', 'API', 'SDK', 'IDE', 'GUI', 'CLI', 'OS', 'IP', 'TCP',
-            'UDP', 'HTTP', 'HTTPS', 'FTP', 'SSH', 'SSL', 'TLS', 'DNS', 'URL', 'URI', 'JSON',
-            'XML', 'HTML', 'CSS', 'JS', 'SQL', 'NoSQL', 'AI', 'ML', 'AR', 'VR', 'IoT', 'GPS',
-            'WIFI', 'LTE', '5G', '4G', '3G', 'RFID', 'NFC', 'QR', 'OCR', 'PDF', 'CSV', 'PNG',
-            'JPG', 'JPEG', 'GIF', 'SVG', 'MP3', 'MP4', 'AVI', 'MOV', 'WAV', 'FLAC',
-            
-            # Chemistry/Materials
-            'CMOS', 'BJT', 'FET', 'MOSFET', 'IC', 'PCB', 'SMD', 'THT', 'PWM', 'ADC', 'DAC',
-            'PLL', 'PID', 'EMI', 'EMC', 'ESD', 'RF', 'IF', 'LF', 'HF', 'UHF', 'VHF',
-            'SMC', 'CFRP', 'GFRP', 'FRP', 'RTM', 'BMC', 'GMT', 'LFT', 'CF', 'GF', 'PP', 'PE',
-            'PA', 'PC', 'POM', 'PEEK', 'PEI', 'PSU', 'TPU', 'PVC', 'ABS', 'SAN', 'PBT', 'PET',
-            
-            # Business/Standards
-            'ISO', 'IEEE', 'ANSI', 'NIST', 'FDA', 'CE', 'FCC', 'UL', 'RoHS', 'REACH',
-            'GDP', 'ROI', 'KPI', 'SLA', 'CRM', 'ERP', 'HR', 'IT', 'QA', 'QC', 'R&D',
-            'CEO', 'CTO', 'CFO', 'COO', 'VP', 'SVP', 'EVP', 'MD', 'GM', 'PM', 'BA',
-            
-            # Automotive
-            'ABS', 'ACC', 'ADAS', 'AEB', 'AFR', 'AGM', 'AWD', 'BMS', 'CAN', 'CVT', 'DCT',
-            'DPF', 'DSC', 'DSG', 'EBD', 'ECU', 'EGR', 'EPS', 'ESC', 'ESP', 'EV', 'FCW',
-            'FWD', 'HEV', 'HUD', 'ICE', 'LDW', 'LKAS', 'MAF', 'MAP', 'MIL', 'OBDII',
-            'PHEV', 'RWD', 'SCR', 'TCU', 'TPMS', 'TCS', 'TSI', 'TFSI', 'TDI', 'VIN',
-            'VSC', 'VVT', 'VTEC', 'V2V', 'V2X', 'V2I', 'LIN', 'MOST', 'FlexRay',
-            'TAPS', 'CBC', 'MKB', 'RMI', 'CDP',  # Additional automotive safety/control systems
-            
-            # Automotive Components/Parts
-            'A/C', 'ACM', 'BCM', 'HVAC', 'EGT', 'IAT', 'O2', 'CKP', 'CMP', 'TPS', 'IAC',
-            'PCV', 'EVAP', 'CAT', 'DOC', 'DPF', 'GPF', 'NOX', 'TWC', 'HEGO', 'UEGO',
-            'AFM', 'VAF', 'MAF', 'MAP', 'BARO', 'CTS', 'ECT', 'EOT', 'IAT', 'CHT',
-            'VVT-i', 'MIVEC', 'AVCS', 'CVVT', 'DVVT', 'VANOS', 'VarioCam', 'MultiAir',
-            'GDI', 'FSI', 'MPFI', 'TBI', 'PFI', 'CRDi', 'CDI', 'HDi', 'dCi', 'CRDI',
-            'DMF', 'SMF', 'LSD', 'ATF', 'MTF', 'DEXRON', 'CVT', 'DSG', 'PDK', 'SMG',
-            'DCT', 'AMT', 'AGS', 'AT', 'MT', 'IMT', 'HGV', 'LCV', 'SUV', 'MPV', 'BEV',
-            
-            # Automotive Materials
-            'HSS', 'AHSS', 'UHSS', 'BIW', 'BIP', 'CRP', 'CFRP', 'GFRP', 'SMC', 'BMC',
-            'RTM', 'RIM', 'LFT', 'GMT', 'TPO', 'TEO', 'PUR', 'EPP', 'EPS', 'POM', 'PA6',
-            'PA66', 'PBT', 'PET', 'ABS', 'PC/ABS', 'ASA', 'SAN', 'PMMA', 'PP', 'PE',
-            'HDPE', 'LDPE', 'LLDPE', 'EVA', 'EPDM', 'SBR', 'NBR', 'CR', 'NR', 'BR',
-            'IIR', 'BIIR', 'CIIR', 'ACM', 'AEM', 'ECO', 'FKM', 'FFKM', 'VMQ', 'FVMQ',
-            'AU', 'EU', 'HNBR', 'CSM', 'CPE', 'PVC', 'TPE', 'TPU', 'TPV', 'TPC', 'TPS',
-            
-            # File extensions and formats
-            'PDF', 'DOC', 'DOCX', 'XLS', 'XLSX', 'PPT', 'PPTX', 'TXT', 'RTF', 'ODT',
-            'ZIP', 'RAR', '7Z', 'TAR', 'GZ', 'BZ2', 'ISO', 'IMG', 'DMG', 'EXE', 'MSI',
-            
-            # Units and measurements
-            'MHz', 'GHz', 'THz', 'kHz', 'Hz', 'V', 'mV', 'kV', 'A', 'mA', 'uA', 'W', 'mW',
-            'kW', 'MW', 'VA', 'VAR', 'Ohm', 'F', 'uF', 'nF', 'pF', 'H', 'mH', 'uH', 'nH',
-            'dB', 'dBm', 'dBi', 'dBc', 'ppm', 'ppb', 'pH'
+# Words are runs of \w characters; everything in between (whitespace and
+# punctuation) is passed through untouched. Splitting with a capturing group
+# yields [sep, word, sep, word, ..., sep] in a single pass.
+WORD_RE = re.compile(r'\w+')
+WORD_SPLIT_RE = re.compile(r'(\w+)')
+NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+NON_WORD_RE = re.compile(r'\W')
+
+# Default number of word decisions kept in memory (override with NORMALIZER_CACHE_SIZE)
+DEFAULT_CACHE_SIZE = 50000
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache with hit/miss/eviction counters."""
+    
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Bumped by invalidate(); put() can refuse values computed before that
+        self.generation = 0
+    
+    def get(self, key):
+        """Return the cached value for key (marking it recently used) or None."""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value, generation=None):
+        """Store a value, evicting the least recently used entries when full.
+        
+        If generation is given, the value is only stored when no invalidate()
+        ran since that generation was read, so a value computed from stale
+        inputs can't be cached after the invalidation that covered it.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def invalidate(self, predicate):
+        """Drop the entries for which predicate(key, value) is true, returning how many."""
+        with self._lock:
+            self.generation += 1
+            stale = [key for key, value in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+    
+    def stats(self):
+        """Return size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+class CompoundTermMatcher:
+    """Aho-Corasick automaton over the token sequences of punctuated terms.
+    
+    Terms like 'PC/ABS', 'A/C' or 'VVT-i' span several words, so the
+    word-level lookup only ever sees their fragments. The automaton is built
+    once from the term set, with words upper-cased and separators kept
+    exact, and finds every such term in one left-to-right pass over a
+    label's token list. Single-word terms are left to the word lookup.
+    """
+    
+    def __init__(self, terms):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        separators = set()
+        
+        for term in terms:
+            tokens = WORD_SPLIT_RE.split(term)
+            # Only terms that start and end with a word and contain a separator
+            if len(tokens) < 5 or tokens[0] or tokens[-1]:
+                continue
+            separators.update(tokens[2:-2:2])
+            state = 0
+            for symbol in self._symbols(tokens[1:-1]):
+                next_state = self._goto[state].get(symbol)
+                if next_state is None:
+                    next_state = self._goto[state][symbol] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(tokens) - 2, tokens[1::2]))
+        
+        # Breadth-first failure links; each state also reports its suffixes' terms
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and symbol not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(symbol, 0) if state else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+        
+        # A label can only hold a compound if it contains a separator's first
+        # character; a character class rejects most labels faster than a scan
+        self._candidate_re = re.compile(
+            '[' + ''.join(sorted(re.escape(separator[0]) for separator in separators)) + ']'
+        ) if separators else None
+    
+    @staticmethod
+    def _symbols(tokens):
+        """Automaton symbols of a token run: words upper-cased, separators as-is."""
+        return [token.upper() if i % 2 == 0 else token for i, token in enumerate(tokens)]
+    
+    def find(self, text, tokens):
+        """Return {token index: (normalized_word, True)} for the compounds in text.
+        
+        tokens is WORD_SPLIT_RE.split(text). Overlapping matches are resolved
+        leftmost-longest, and each matched word takes its spelling in the
+        term list. Returns None when text holds no compound term.
+        """
+        if self._candidate_re is None or self._candidate_re.search(text) is None:
+            return None
+        
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for i in range(1, len(tokens) - 1):
+            symbol = tokens[i].upper() if i % 2 else tokens[i]
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for length, words in output[state]:
+                matches.append((i - length + 1, i + 1, words))
+        if not matches:
+            return None
+        
+        # Earliest start first, longest first among equal starts
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        overrides = {}
+        end = 0
+        for start, stop, words in matches:
+            if start >= end:
+                for offset, word in enumerate(words):
+                    overrides[start + 2 * offset] = (word, True)
+                end = stop
+        return overrides
+
+# Versioned term dictionaries, one <domain>.json file per domain
+TERMS_DIR = os.environ.get(
+    'NORMALIZER_TERMS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'terms')
+)
+
+# Seconds between checks of the term files for edits (0 disables the watch)
+TERMS_POLL_INTERVAL = float(os.environ.get('NORMALIZER_TERMS_POLL', 2))
+
+def terms_signature(terms_dir):
+    """Names, sizes and mtimes of the dictionary files, to notice edits cheaply."""
+    with os.scandir(terms_dir) as entries:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in entries if entry.name.endswith('.json') and entry.is_file()
+        ))
+
+def load_term_domains(terms_dir):
+    """Read every dictionary file in terms_dir, returning {domain: (version, terms)}."""
+    domains = {}
+    for name, _, _ in terms_signature(terms_dir):
+        path = os.path.join(terms_dir, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}") from e
+        domain = data.get('domain', name[:-5])
+        version = data.get('version')
+        terms = data.get('terms')
+        if not isinstance(version, int) or not isinstance(terms, list) \
+                or not all(isinstance(term, str) and term for term in terms):
+            raise ValueError(f"{path}: expected an integer 'version' and a list of non-empty 'terms'")
+        if domain in domains:
+            raise ValueError(f"{path}: domain '{domain}' is defined twice")
+        domains[domain] = (version, frozenset(terms))
+    if not domains:
+        raise ValueError(f"No term dictionaries found in {terms_dir}")
+    return domains
+
+class TermSnapshot:
+    """Immutable lookup tables compiled from one set of term dictionaries.
+    
+    Normalizers read the term set and compound matcher through a single
+    snapshot reference, so replacing it swaps every table at once.
+    version is a digest of the dictionaries' contents.
+    """
+    
+    def __init__(self, domains):
+        self.domains = dict(sorted(domains.items()))
+        self.terms = frozenset().union(*(terms for _, terms in self.domains.values()))
+        self.compound_matcher = CompoundTermMatcher(self.terms)
+        
+        digest = hashlib.blake2b(digest_size=8)
+        for domain, (version, terms) in self.domains.items():
+            digest.update(json.dumps([domain, version, sorted(terms)], ensure_ascii=False).encode('utf-8'))
+        self.version = digest.hexdigest()
+    
+    @classmethod
+    def from_directory(cls, terms_dir=TERMS_DIR):
+        """Compile the dictionaries in terms_dir."""
+        return cls(load_term_domains(terms_dir))
+    
+    def info(self):
+        """Snapshot version plus each domain's file version and term count."""
+        return {
+            'version': self.version,
+            'terms': len(self.terms),
+            'domains': {domain: {'version': version, 'terms': len(terms)}
+                        for domain, (version, terms) in self.domains.items()}
         }
+
+def word_affected_by(changed_terms):
+    """Return a predicate telling whether a cached word decision may depend on changed_terms.
+    
+    A decision looks terms up by the upper-cased word, or by the pieces of
+    a hyphenated or possessive word, so only words matching one of those
+    can change. Compound terms are resolved per label and never cached.
+    """
+    changed = {term.upper() for term in changed_terms}
+    
+    def affected(word):
+        word = word.upper()
+        return word in changed or any(part in changed for part in re.split(r"[-']", word))
+    return affected
+
+def label_affected_by(changed_terms):
+    """Return a predicate telling whether a stored label analysis may depend on changed_terms."""
+    affected_word = word_affected_by(changed_terms)
+    compounds = [term.upper() for term in changed_terms if NON_WORD_RE.search(term)]
+    
+    def affected(label):
+        if not isinstance(label, str):
+            return False
+        upper = label.upper()
+        return (any(affected_word(word) for word in WORD_RE.findall(label))
+                or any(compound in upper for compound in compounds))
+    return affected
+
+# Compact on-disk copy of the spell-check vocabulary, written the first time
+# the full pyspellchecker dictionary is loaded and reused on later starts
+DICTIONARY_CACHE = os.environ.get(
+    'NORMALIZER_DICTIONARY_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.normalizer_cache', 'spell_words_en.txt')
+)
+
+def load_dictionary_words(cache_path=DICTIONARY_CACHE):
+    """Return the set of dictionary words is_real_word() can match.
+    
+    Only lowercase ASCII words of two or more letters can ever be looked up,
+    so those are all that is kept. The list is read from cache_path when it
+    was built by the installed pyspellchecker version, and rebuilt otherwise.
+    """
+    header = f"# pyspellchecker {getattr(spellchecker, '__version__', 'unknown')} en\n"
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            if f.readline() == header:
+                return frozenset(f.read().split('\n'))
+    except OSError:
+        pass
+    
+    words = frozenset(
+        word for word in SpellChecker().word_frequency.dictionary
+        if len(word) >= 2 and word.isascii() and word.isalpha() and word.islower()
+    )
+    
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.write('\n'.join(sorted(words)))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Read-only checkout: keep using the in-memory set
+    
+    return words
+
+class IntelligentNormalizer:
+    def __init__(self, cache_size=None, terms_dir=None):
+        # The spell-check vocabulary is loaded on first use (see warm_up)
+        self._dictionary_words = None
+        self._spell = None
+        self._dictionary_lock = threading.Lock()
+        
+        if cache_size is None:
+            cache_size = int(os.environ.get('NORMALIZER_CACHE_SIZE', DEFAULT_CACHE_SIZE))
+        self.word_cache = LRUCache(cache_size)
+        
+        # Technical acronyms and abbreviations that should be preserved, read
+        # from the versioned dictionaries in terms_dir (see reload_terms)
+        self.terms_dir = terms_dir or TERMS_DIR
+        self._terms_signature = terms_signature(self.terms_dir)
+        self.snapshot = TermSnapshot.from_directory(self.terms_dir)
+        self._terms_lock = threading.Lock()
+        self._next_terms_check = 0.0
         
         # Patterns for technical terms
         self.technical_patterns = [
@@ -89,78 +373,153 @@ class IntelligentNormalizer:
             r'.*e-mail.*',      # e-mail variations
             r'.*i-\w+.*',       # i-prefixed words
         ]
+        
+        self._compile_patterns()
+    
+    @property
+    def technical_terms(self):
+        """Term set of the current snapshot."""
+        return self.snapshot.terms
+    
+    @property
+    def compound_matcher(self):
+        """Compound term matcher of the current snapshot."""
+        return self.snapshot.compound_matcher
+    
+    def swap_snapshot(self, snapshot):
+        """Install a new term snapshot, returning (changed terms, invalidated words).
+        
+        Requests already running finish on whichever tables they read; the
+        word cache only loses the decisions the changed terms can affect.
+        """
+        previous = self.snapshot
+        if snapshot.version == previous.version:
+            return frozenset(), 0
+        changed_terms = previous.terms ^ snapshot.terms
+        # Swap first: classify_word won't cache decisions made before the invalidation
+        self.snapshot = snapshot
+        affected = word_affected_by(changed_terms)
+        return changed_terms, self.word_cache.invalidate(lambda word, _: affected(word))
+    
+    def reload_terms(self):
+        """Re-read the term dictionaries and swap them in if they changed.
+        
+        Returns swap_snapshot's result. A file that fails to load raises
+        ValueError (or OSError) and leaves the current snapshot in place.
+        """
+        with self._terms_lock:
+            # Recorded up front so a broken file isn't retried until it changes again
+            self._terms_signature = terms_signature(self.terms_dir)
+            return self.swap_snapshot(TermSnapshot.from_directory(self.terms_dir))
+    
+    def terms_changed(self, interval=TERMS_POLL_INTERVAL):
+        """Whether the dictionary files were edited, checked at most every interval seconds."""
+        if interval <= 0:
+            return False
+        now = time.monotonic()
+        if now < self._next_terms_check:
+            return False
+        self._next_terms_check = now + interval
+        try:
+            return terms_signature(self.terms_dir) != self._terms_signature
+        except OSError:
+            return False
+    
+    @property
+    def dictionary_words(self):
+        """Spell-check vocabulary, loaded on first access."""
+        if self._dictionary_words is None:
+            with self._dictionary_lock:
+                if self._dictionary_words is None:
+                    self._dictionary_words = load_dictionary_words()
+        return self._dictionary_words
+    
+    @property
+    def spell(self):
+        """Full pyspellchecker instance, only built if something asks for it."""
+        if self._spell is None:
+            with self._dictionary_lock:
+                if self._spell is None:
+                    self._spell = SpellChecker()
+        return self._spell
+    
+    def warm_up(self):
+        """Load the dictionary now rather than on the first request."""
+        return len(self.dictionary_words)
+    
+    def _compile_patterns(self):
+        """Pre-compile the pattern lists into one alternation regex each."""
+        self._technical_re = re.compile('|'.join(f'(?:{p})' for p in self.technical_patterns))
+        self._preserve_re = re.compile('|'.join(f'(?:{p})' for p in self.preserve_patterns))
     
     def is_technical_term(self, word):
         """Check if a word is a technical term that should be preserved."""
-        word_upper = word.upper()
-        
         # Check against known technical terms
-        if word_upper in self.technical_terms:
+        if word.upper() in self.technical_terms:
             return True
         
         # Check against technical patterns
-        for pattern in self.technical_patterns:
-            if re.match(pattern, word):
-                return True
-        
-        return False
+        return self._technical_re.match(word) is not None
     
     def is_real_word(self, word):
         """Check if a word is in the dictionary."""
         # Clean the word for spell checking
-        clean_word = re.sub(r'[^a-zA-Z]', '', word.lower())
+        clean_word = NON_ALPHA_RE.sub('', word.lower())
         if len(clean_word) < 2:
             return False
         
-        return clean_word in self.spell
+        return clean_word in self.dictionary_words
     
-    def should_preserve_case(self, word):
-        """Determine if a word's case should be preserved."""
+    def _matches_case_rules(self, word):
+        """Case-sensitive preserve rules that don't depend on the term list."""
         # Check preserve patterns (case-sensitive for acronym detection)
-        for pattern in self.preserve_patterns:
-            if re.match(pattern, word):  # Removed re.IGNORECASE
-                return True
-        
-        # If it's all uppercase and is a technical term, preserve it
-        if word.isupper() and self.is_technical_term(word):
-            return True
-        
-        # If it's all uppercase but NOT a real word, it's likely an acronym
-        if word.isupper() and not self.is_real_word(word):
-            return True
-        
-        # Special case: if it's a known technical term regardless of case, preserve its uppercase form
-        if word.upper() in self.technical_terms:
+        if self._preserve_re.match(word):
             return True
         
-        return False
+        # All-uppercase words that look technical or aren't real words are likely acronyms
+        return word.isupper() and (self._technical_re.match(word) is not None
+                                   or not self.is_real_word(word))
     
-    def normalize_word(self, word):
-        """Normalize a single word with intelligent case handling."""
-        # Handle empty or very short words
-        if len(word) < 2:
-            return word
-        
-        # Check if this word should be converted to uppercase (known technical terms)
-        if word.upper() in self.technical_terms:
-            return word.upper()
+    def should_preserve_case(self, word):
+        """Determine if a word's case should be preserved."""
+        # A known technical term regardless of case keeps its uppercase form
+        return word.upper() in self.technical_terms or self._matches_case_rules(word)
+    
+    def classify_word(self, word):
+        """Classify a word once, returning (normalized_word, preserve_case)."""
+        decision = self.word_cache.get(word)
+        if decision is None:
+            generation = self.word_cache.generation
+            decision = self._classify_uncached(word)
+            self.word_cache.put(word, decision, generation)
+        return decision
+    
+    def _classify_uncached(self, word):
+        """Apply the technical term and case rules to a single word."""
+        upper = word.upper()
+        if upper in self.technical_terms:
+            # Known technical terms are converted to uppercase
+            return (word if len(word) < 2 else upper), True
         
-        # Preserve case for technical terms and acronyms
-        if self.should_preserve_case(word):
-            return word
+        preserve = self._matches_case_rules(word)
+        if len(word) < 2 or preserve:
+            return word, preserve
         
+        return self._normalize_compound(word), False
+    
+    def _normalize_part(self, part):
+        """Normalize one piece of a hyphenated or possessive word."""
+        if part.upper() in self.technical_terms:
+            return part.upper()
+        elif self.should_preserve_case(part):
+            return part
+        return part.lower().capitalize()
+    
+    def _normalize_compound(self, word):
+        """Proper-case a word that is neither a technical term nor preserved."""
         # Handle hyphenated words
         if '-' in word:
-            parts = word.split('-')
-            normalized_parts = []
-            for part in parts:
-                if part.upper() in self.technical_terms:
-                    normalized_parts.append(part.upper())
-                elif self.should_preserve_case(part):
-                    normalized_parts.append(part)
-                else:
-                    normalized_parts.append(part.lower().capitalize())
-            return '-'.join(normalized_parts)
+            return '-'.join(self._normalize_part(part) for part in word.split('-'))
         
         # Handle words with apostrophes
         if "'" in word:
@@ -169,76 +528,621 @@ class IntelligentNormalizer:
                 return word.lower()
             # For possessives, capitalize the main word
             if word.endswith("'s") or word.endswith("'S"):
-                main_word = word[:-2]
-                if main_word.upper() in self.technical_terms:
-                    return main_word.upper() + "'s"
-                elif self.should_preserve_case(main_word):
-                    return main_word + "'s"
-                else:
-                    return main_word.lower().capitalize() + "'s"
+                return self._normalize_part(word[:-2]) + "'s"
         
         # Regular proper case for normal words
         return word.lower().capitalize()
     
+    def normalize_word(self, word):
+        """Normalize a single word with intelligent case handling."""
+        return self.classify_word(word)[0]
+    
+    def _classify_tokens(self, text):
+        """Tokenize text in one pass and classify every word exactly once.
+        
+        Returns the token list with each word replaced by its normalized form
+        (words sit at odd indices, whitespace/punctuation runs at even ones),
+        plus the list of preserved words and the list of changed words.
+        """
+        tokens = WORD_SPLIT_RE.split(text)
+        return self._apply_decisions(tokens, {word: self.classify_word(word) for word in tokens[1::2]},
+                                     self.compound_matcher.find(text, tokens))
+    
+    @staticmethod
+    def _apply_decisions(tokens, decisions, overrides=None):
+        """Rewrite the words of a split token list in place (see _classify_tokens).
+        
+        decisions maps each word to its (normalized_word, preserve_case) pair;
+        overrides, if given, replaces that pair for the words at some token
+        indexes (those inside a compound term).
+        """
+        preserved_terms = []
+        changed_words = []
+        
+        for i in range(1, len(tokens), 2):
+            word = tokens[i]
+            if overrides and i in overrides:
+                normalized, preserve = overrides[i]
+            else:
+                normalized, preserve = decisions[word]
+            if preserve:
+                preserved_terms.append(word)
+            if normalized != word:
+                changed_words.append({
+                    'original': word,
+                    'normalized': normalized,
+                    'position': i // 2
+                })
+                tokens[i] = normalized
+        
+        return tokens, preserved_terms, changed_words
+    
     def normalize_text(self, text):
         """Normalize text while preserving technical terms and acronyms."""
         if not text or not isinstance(text, str):
             return text
         
-        # Enhanced tokenization that better handles parentheses and punctuation
-        # This regex captures: words, spaces, and punctuation separately
-        tokens = re.findall(r'\b\w+\b|\s+|[^\w\s]', text)
-        
-        normalized_tokens = []
-        for token in tokens:
-            if re.match(r'\b\w+\b', token):  # It's a word
-                normalized_tokens.append(self.normalize_word(token))
-            else:  # It's whitespace or punctuation
-                normalized_tokens.append(token)
-        
-        return ''.join(normalized_tokens)
+        tokens, _, _ = self._classify_tokens(text)
+        return ''.join(tokens)
     
     def analyze_text(self, text):
         """Analyze text and provide detailed information about normalization."""
         if not text or not isinstance(text, str):
-            return {
-                'original': text,
-                'normalized': text,
-                'changed': False,
-                'preserved_terms': [],
-                'normalized_words': []
-            }
+            return self._unchanged_analysis(text)
         
-        original = text
-        normalized = self.normalize_text(text)
+        return self._build_analysis(text, *self._classify_tokens(text))
+    
+    def analyze_batch(self, labels):
+        """Analyze a list of labels, classifying each distinct word once.
         
-        # Find preserved terms
-        words = re.findall(r'\b\w+\b', text)
-        preserved_terms = [word for word in words if self.should_preserve_case(word)]
+        Every label is split up front and the words of the whole batch are
+        deduplicated before classification, so a word shared by thousands of
+        labels costs one decision instead of one cache lookup per occurrence.
+        Results are identical to calling analyze_text on each label.
+        """
+        split = [WORD_SPLIT_RE.split(label) if label and isinstance(label, str) else None
+                 for label in labels]
         
-        # Find normalized words
-        original_words = re.findall(r'\b\w+\b', original)
-        normalized_words = re.findall(r'\b\w+\b', normalized)
+        unique_words = set()
+        for tokens in split:
+            if tokens is not None:
+                unique_words.update(tokens[1::2])
+        decisions = {word: self.classify_word(word) for word in unique_words}
         
-        changed_words = []
-        for i, (orig, norm) in enumerate(zip(original_words, normalized_words)):
-            if orig != norm:
-                changed_words.append({
-                    'original': orig,
-                    'normalized': norm,
-                    'position': i
-                })
+        results = []
+        for label, tokens in zip(labels, split):
+            if tokens is None:
+                results.append(self._unchanged_analysis(label))
+            else:
+                overrides = self.compound_matcher.find(label, tokens)
+                results.append(self._build_analysis(label, *self._apply_decisions(tokens, decisions, overrides)))
+        return results
+    
+    @staticmethod
+    def _unchanged_analysis(text):
+        """Analysis of an empty or non-string label, which is passed through."""
+        return {
+            'original': text,
+            'normalized': text,
+            'changed': False,
+            'preserved_terms': [],
+            'normalized_words': []
+        }
+    
+    @staticmethod
+    def _build_analysis(text, tokens, preserved_terms, changed_words):
+        """Assemble the analysis of text from its classified tokens."""
+        normalized = ''.join(tokens)
+        
+        if changed_words and not text.isascii():
+            # Case mapping can split a non-ASCII word (e.g. 'İ'.lower() adds a
+            # combining mark), so pair words up by re-tokenizing the output.
+            original_words = WORD_RE.findall(text)
+            normalized_words = WORD_RE.findall(normalized)
+            changed_words = [
+                {'original': orig, 'normalized': norm, 'position': i}
+                for i, (orig, norm) in enumerate(zip(original_words, normalized_words))
+                if orig != norm
+            ]
         
         return {
-            'original': original,
+            'original': text,
             'normalized': normalized,
-            'changed': original != normalized,
+            'changed': text != normalized,
             'preserved_terms': preserved_terms,
             'normalized_words': changed_words
         }
 
+# Batches with at least PARALLEL_THRESHOLD labels are sharded across
+# PARALLEL_WORKERS processes; smaller ones stay in-process
+PARALLEL_THRESHOLD = int(os.environ.get('NORMALIZER_PARALLEL_THRESHOLD', 5000))
+PARALLEL_WORKERS = int(os.environ.get('NORMALIZER_WORKERS', os.cpu_count() or 1))
+
+# Per-process normalizer, built once by the pool initializer
+_worker_normalizer = None
+
+def _init_worker(cache_size, terms_dir):
+    """Warm a normalizer (dictionary, term tables, patterns) in a pool worker."""
+    global _worker_normalizer
+    _worker_normalizer = IntelligentNormalizer(cache_size=cache_size, terms_dir=terms_dir)
+    _worker_normalizer.warm_up()
+
+def _analyze_shard(snapshot, labels):
+    """Analyze one shard of labels inside a pool worker, using the parent's term snapshot."""
+    if _worker_normalizer.snapshot.version != snapshot.version:
+        _worker_normalizer.swap_snapshot(snapshot)
+    return _worker_normalizer.analyze_batch(labels)
+
+class ParallelNormalizer:
+    """Analyze large label batches across a pool of worker processes."""
+    
+    def __init__(self, normalizer, workers=PARALLEL_WORKERS, threshold=PARALLEL_THRESHOLD,
+                 shards_per_worker=4, store=None):
+        self.normalizer = normalizer
+        self.store = store
+        self.workers = workers
+        self.threshold = threshold
+        self.shards_per_worker = shards_per_worker
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self):
+        """Start the worker pool on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.normalizer.word_cache.maxsize, self.normalizer.terms_dir)
+                )
+            return self._pool
+    
+    def analyze_batch(self, labels):
+        """Analyze labels, returning results in input order.
+        
+        With a result store, stored analyses are used for the labels it has
+        and only the rest are computed (and then stored).
+        """
+        if self.store is None:
+            return self._compute(labels)
+        
+        snapshot = self.normalizer.snapshot.version
+        unique = list(dict.fromkeys(label for label in labels if isinstance(label, str) and label))
+        known = self.store.get_many(snapshot, unique)
+        missing = [label for label in unique if label not in known]
+        computed = dict(zip(missing, self._compute(missing)))
+        self.store.put_many(snapshot, computed)
+        known.update(computed)
+        return [known[label] if isinstance(label, str) and label else self.normalizer.analyze_text(label)
+                for label in labels]
+    
+    def _compute(self, labels):
+        """Analyze labels in-process or across the worker pool."""
+        if self.workers <= 1 or len(labels) < self.threshold:
+            return self.normalizer.analyze_batch(labels)
+        
+        shard_size = -(-len(labels) // (self.workers * self.shards_per_worker))
+        shards = [labels[i:i + shard_size] for i in range(0, len(labels), shard_size)]
+        
+        # map() yields shard results in submission order
+        results = []
+        snapshot = self.normalizer.snapshot
+        for shard_results in self._get_pool().map(_analyze_shard, [snapshot] * len(shards), shards):
+            results.extend(shard_results)
+        return results
+    
+    def close(self):
+        """Shut down the worker pool, if it was started."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+# Optional SQLite file keeping label analyses across restarts (unset: disabled)
+RESULT_STORE_PATH = os.environ.get('NORMALIZER_RESULT_STORE')
+RESULT_STORE_SIZE = int(os.environ.get('NORMALIZER_RESULT_STORE_SIZE', 256)) * 1024 * 1024
+
+# Bump when a change to the normalizer alters its analyses for the same terms
+RESULT_STORE_VERSION = 1
+
+class ResultStore:
+    """Persistent label analyses in SQLite, keyed by (term snapshot version, label).
+    
+    Lookups read the database directly; new analyses and last-use updates
+    are queued and written behind by a background thread in batched
+    transactions, so requests never wait on a write. When the live data
+    outgrows max_bytes, the least recently used rows are deleted. Each
+    process (including forked server workers) opens its own connections
+    and writer thread on first use.
+    """
+    
+    LOOKUP_CHUNK = 500
+    WRITE_BATCH = 5000
+    # Seconds before a hit refreshes a row's last-use time
+    TOUCH_INTERVAL = 3600
+    
+    def __init__(self, path, max_bytes=RESULT_STORE_SIZE, max_pending=100000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.dropped = 0
+        self.evictions = 0
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._local = threading.local()
+        self._queue = None
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(path)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            if db.execute('PRAGMA user_version').fetchone()[0] != RESULT_STORE_VERSION:
+                db.execute('DROP TABLE IF EXISTS results')
+                db.execute(f'PRAGMA user_version = {RESULT_STORE_VERSION}')
+            db.execute('''CREATE TABLE IF NOT EXISTS results (
+                snapshot TEXT NOT NULL,
+                label TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (snapshot, label)
+            ) WITHOUT ROWID''')
+            db.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+            db.commit()
+        finally:
+            db.close()
+    
+    def _connection(self):
+        """This thread's connection, started (again, after a fork) on first use."""
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._local = threading.local()
+                self._queue = queue.Queue(self.max_pending)
+                threading.Thread(target=self._write_behind, name='result-store', daemon=True).start()
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+        return db
+    
+    def get_many(self, snapshot, labels):
+        """Return {label: analysis} for the stored analyses of labels (all strings)."""
+        db = self._connection()
+        found = {}
+        stale = []
+        now = int(time.time())
+        for i in range(0, len(labels), self.LOOKUP_CHUNK):
+            chunk = labels[i:i + self.LOOKUP_CHUNK]
+            rows = db.execute(
+                f"SELECT label, analysis, used FROM results WHERE snapshot = ? AND label IN ({','.join('?' * len(chunk))})",
+                [snapshot, *chunk]
+            )
+            for label, analysis, used in rows:
+                found[label] = json.loads(analysis)
+                if now - used > self.TOUCH_INTERVAL:
+                    stale.append(label)
+        self.hits += len(found)
+        self.misses += len(labels) - len(found)
+        if stale:
+            self._enqueue(('touch', now, snapshot, stale))
+        return found
+    
+    def put_many(self, snapshot, analyses):
+        """Queue {label: analysis} to be serialized and written behind."""
+        if analyses:
+            self._connection()
+            self._enqueue(('put', int(time.time()), snapshot, list(analyses.items())))
+    
+    def _enqueue(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += len(item[3])
+    
+    def flush(self):
+        """Block until every queued write has been committed."""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+    
+    def _write_behind(self):
+        work = self._queue
+        db = sqlite3.connect(self.path, timeout=30)
+        while True:
+            batch = [work.get()]
+            pending = len(batch[0][3])
+            while pending < self.WRITE_BATCH:
+                try:
+                    batch.append(work.get_nowait())
+                except queue.Empty:
+                    break
+                pending += len(batch[-1][3])
+            try:
+                with db:
+                    for kind, now, snapshot, items in batch:
+                        if kind == 'put':
+                            db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', [
+                                (snapshot, label, json.dumps(analysis, ensure_ascii=False, separators=(',', ':')), now)
+                                for label, analysis in items
+                            ])
+                            self.writes += len(items)
+                        else:
+                            db.executemany('UPDATE results SET used = ? WHERE snapshot = ? AND label = ?',
+                                           [(now, snapshot, label) for label in items])
+                self._evict(db)
+            except sqlite3.Error as e:
+                print(f"⚠️  Result store write failed: {e}")
+            finally:
+                for _ in batch:
+                    work.task_done()
+    
+    def size(self, db=None):
+        """Bytes of live data in the database (excluding free pages)."""
+        db = db or self._connection()
+        page_size = db.execute('PRAGMA page_size').fetchone()[0]
+        pages = db.execute('PRAGMA page_count').fetchone()[0] - db.execute('PRAGMA freelist_count').fetchone()[0]
+        return pages * page_size
+    
+    def _evict(self, db):
+        """Delete least recently used rows until the live data fits in max_bytes."""
+        size = self.size(db)
+        if size <= self.max_bytes:
+            return
+        rows = db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        # Go a tenth below the cap so eviction doesn't run on every write
+        excess = rows - int(rows * self.max_bytes * 0.9 / size)
+        with db:
+            db.execute('DELETE FROM results WHERE (snapshot, label) IN '
+                       '(SELECT snapshot, label FROM results ORDER BY used LIMIT ?)', (excess,))
+        self.evictions += excess
+    
+    def stats(self):
+        """Return hit/miss/write counters and the writes still queued."""
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'pending': self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+            'dropped': self.dropped,
+            'evictions': self.evictions,
+            'max_bytes': self.max_bytes,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+# Seconds a coalesced batch result stays cached, and how many are kept
+RESULT_TTL = float(os.environ.get('NORMALIZER_RESULT_TTL', 30))
+RESULT_CACHE_ENTRIES = int(os.environ.get('NORMALIZER_RESULT_CACHE_ENTRIES', 16))
+
+def batch_digest(kind, payload):
+    """Hash a request payload so identical batches map to the same key."""
+    encoded = json.dumps([kind, payload], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+class BatchCoalescer:
+    """Run identical concurrent batches once and share the result.
+    
+    All bookkeeping lives on a private asyncio event loop: the first request
+    for a digest starts the computation in the default executor, later
+    requests for the same digest await the same future, and finished results
+    are kept for a short TTL. Request threads hand work to the loop with
+    run_coroutine_threadsafe(), so no locks are needed around the tables.
+    Like LRUCache, a result is only kept if no invalidate() ran while it was
+    being computed.
+    """
+    
+    def __init__(self, ttl=RESULT_TTL, max_entries=RESULT_CACHE_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self._loop = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._inflight = {}
+        self._results = OrderedDict()
+    
+    def _get_loop(self):
+        """Start the event loop thread (again, after a fork) on first use."""
+        with self._start_lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                self._inflight = {}
+                threading.Thread(target=self._loop.run_forever, name='batch-coalescer', daemon=True).start()
+            return self._loop
+    
+    async def _resolve(self, digest, compute):
+        loop = asyncio.get_running_loop()
+        
+        cached = self._results.get(digest)
+        if cached is not None:
+            expires, result = cached
+            if expires > loop.time():
+                self.cache_hits += 1
+                return result
+            del self._results[digest]
+        
+        future = self._inflight.get(digest)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        
+        future = loop.create_future()
+        self._inflight[digest] = future
+        generation = self.generation
+        self.computed += 1
+        try:
+            result = await loop.run_in_executor(None, compute)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved in case nobody else was waiting
+            raise
+        finally:
+            if self._inflight.get(digest) is future:
+                del self._inflight[digest]
+        
+        future.set_result(result)
+        # A result computed across an invalidate() may come from the old terms
+        if self.ttl > 0 and self.max_entries > 0 and generation == self.generation:
+            self._results[digest] = (loop.time() + self.ttl, result)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+    
+    async def _invalidate(self, predicate):
+        # Later requests start their own computation instead of joining one
+        # that may use the old terms
+        self.generation += 1
+        self._inflight.clear()
+        stale = [digest for digest, (_, result) in self._results.items() if predicate(result)]
+        for digest in stale:
+            del self._results[digest]
+        return len(stale)
+    
+    def invalidate(self, predicate):
+        """Drop cached results for which predicate(result) is true, returning how many."""
+        return asyncio.run_coroutine_threadsafe(self._invalidate(predicate), self._get_loop()).result()
+    
+    def run(self, digest, compute):
+        """Return compute()'s result, sharing it with identical requests."""
+        return asyncio.run_coroutine_threadsafe(self._resolve(digest, compute), self._get_loop()).result()
+    
+    def stats(self):
+        """Return computation, coalescing and cache counters."""
+        return {
+            'computed': self.computed,
+            'coalesced': self.coalesced,
+            'cache_hits': self.cache_hits,
+            'inflight': len(self._inflight),
+            'cached_results': len(self._results),
+            'ttl_seconds': self.ttl
+        }
+
+# Previous analyses kept for incremental passes, keyed by (catalog, node id)
+INCREMENTAL_ENTRIES = int(os.environ.get('NORMALIZER_INCREMENTAL_ENTRIES', 200000))
+
+def label_hash(label):
+    """32-bit FNV-1a hash of a label's UTF-8 bytes, as 8 hex digits.
+    
+    Matches labelHash() in index.html, which computes it client-side; a
+    missing (None) label hashes like the empty string on both sides.
+    """
+    value = 0x811c9dc5
+    for byte in ('' if label is None else str(label)).encode('utf-8'):
+        value = ((value ^ byte) * 0x01000193) & 0xffffffff
+    return f'{value:08x}'
+
 # Initialize the normalizer
 normalizer = IntelligentNormalizer()
+result_store = ResultStore(RESULT_STORE_PATH) if RESULT_STORE_PATH else None
+if result_store is not None:
+    atexit.register(result_store.flush)
+batch_normalizer = ParallelNormalizer(normalizer, store=result_store)
+coalescer = BatchCoalescer()
+incremental_results = LRUCache(INCREMENTAL_ENTRIES)
+
+# When set, /admin endpoints require this value in an X-Admin-Token header
+ADMIN_TOKEN = os.environ.get('NORMALIZER_ADMIN_TOKEN')
+
+def apply_term_reload():
+    """Reload the term dictionaries, dropping every stored result they affect.
+    
+    Returns (changed terms, invalidated entries per cache).
+    """
+    changed_terms, invalidated_words = normalizer.reload_terms()
+    invalidated = {'word_cache': invalidated_words, 'incremental': 0, 'coalescer': 0}
+    if changed_terms:
+        affected = label_affected_by(changed_terms)
+        invalidated['incremental'] = incremental_results.invalidate(
+            lambda _, stored: affected(stored[1]['original']))
+        invalidated['coalescer'] = coalescer.invalidate(
+            lambda result: any(affected(analysis['original'])
+                               for analysis in (result if isinstance(result, list) else [result])))
+    return changed_terms, invalidated
+
+# Bytes read from the request body per chunk, and NDJSON lines buffered per
+# response chunk, for /normalize/stream
+STREAM_READ_SIZE = 64 * 1024
+STREAM_FLUSH_LINES = 200
+
+def iter_ndjson_labels(stream):
+    """Yield one label per non-empty line of a newline-delimited JSON body."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_json_array_labels(stream, read_size=STREAM_READ_SIZE):
+    """Yield the items of a JSON array body without parsing it all at once."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    
+    while True:
+        # Skip whitespace and item separators
+        while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ',')):
+            pos += 1
+        
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError('Expected a JSON array of labels')
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A value cut off by the chunk boundary (e.g. '1' of '1.5') may still
+            # decode, so only accept it once a delimiter follows it
+            if end is not None and (eof or (end < len(buffer) and buffer[end] in ' \t\r\n,]')):
+                yield item
+                pos = end
+                continue
+        elif eof:
+            raise ValueError('Unexpected end of JSON array')
+        
+        chunk = stream.read(read_size)
+        if not chunk:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+@app.before_request
+def limit_request_size():
+    """Reject bodies over MAX_CONTENT_LENGTH before the endpoints read them."""
+    limit = app.config.get('MAX_CONTENT_LENGTH')
+    if limit is not None and (request.content_length or 0) > limit:
+        abort(413)
+
+@app.before_request
+def watch_terms():
+    """Swap in edited term dictionaries, checked at most every NORMALIZER_TERMS_POLL seconds."""
+    if normalizer.terms_changed():
+        try:
+            changed_terms, invalidated = apply_term_reload()
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Keeping the current term dictionaries: {e}")
+            return
+        if changed_terms:
+            print(f"📚 Term dictionaries {normalizer.snapshot.version} loaded: "
+                  f"{len(changed_terms)} terms changed, {sum(invalidated.values())} cached results dropped")
 
 @app.route('/normalize', methods=['POST'])
 def normalize_labels():
@@ -247,10 +1151,7 @@ def normalize_labels():
         data = request.get_json()
         labels = data.get('labels', [])
         
-        results = []
-        for label in labels:
-            analysis = normalizer.analyze_text(label)
-            results.append(analysis)
+        results = batch_normalizer.analyze_batch(labels)
         
         return jsonify({
             'success': True,
@@ -263,6 +1164,34 @@ def normalize_labels():
             'error': str(e)
         }), 500
 
+@app.route('/normalize/stream', methods=['POST'])
+def normalize_labels_stream():
+    """Normalize a stream of labels, returning one NDJSON analysis per label.
+    
+    Accepts either newline-delimited JSON (one label per line, sent as
+    application/x-ndjson) or a plain JSON array of labels, which is parsed
+    incrementally. Results are written back in input order as they are ready.
+    """
+    if request.mimetype == 'application/json':
+        labels = iter_json_array_labels(request.stream)
+    else:
+        labels = iter_ndjson_labels(request.stream)
+    
+    def generate():
+        lines = []
+        try:
+            for label in labels:
+                lines.append(json.dumps(normalizer.analyze_text(label), ensure_ascii=False))
+                if len(lines) >= STREAM_FLUSH_LINES:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+        except Exception as e:
+            lines.append(json.dumps({'success': False, 'error': str(e)}))
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/normalize-text', methods=['POST'])
 def normalize_single_text():
     """Normalize a single text and return simple result."""
@@ -310,15 +1239,155 @@ def analyze_text():
             'error': str(e)
         }), 500
 
+@app.route('/normalize/incremental', methods=['POST'])
+def normalize_labels_incremental():
+    """Normalize only the labels that changed since the previous pass.
+    
+    The client first sends [id, hash] pairs for every node. Entries whose
+    hash matches the stored analysis are answered from the store; the rest
+    are returned as `stale`. The client then sends the same request again
+    with a `labels` object holding the text of just the stale ids, which
+    are analyzed through the coalescer like /async/normalize. Results are
+    returned only for labels the normalizer would change, unless
+    `include_unchanged` is set.
+    """
+    try:
+        data = request.get_json()
+        catalog = data.get('catalog', 'default')
+        # JSON object keys are strings, so ids are compared (and stored) as strings
+        entries = [(str(node_id), digest) for node_id, digest in data.get('entries', [])]
+        labels = data.get('labels', {})
+        include_unchanged = data.get('include_unchanged', False)
+        
+        results = {}
+        stale = []
+        unchanged = 0
+        generation = incremental_results.generation
+        fresh_ids = [node_id for node_id, _ in entries if node_id in labels]
+        fresh_labels = [labels[node_id] for node_id in fresh_ids]
+        # Identical passes from several editors share one analysis
+        analyses = coalescer.run(batch_digest('normalize', fresh_labels),
+                                 lambda: batch_normalizer.analyze_batch(fresh_labels)) if fresh_labels else []
+        fresh = dict(zip(fresh_ids, analyses))
+        
+        for node_id, digest in entries:
+            key = (catalog, node_id)
+            if node_id in fresh:
+                analysis = fresh[node_id]
+                incremental_results.put(key, (label_hash(labels[node_id]), analysis), generation)
+            else:
+                stored = incremental_results.get(key)
+                if stored is None or stored[0] != digest:
+                    stale.append(node_id)
+                    continue
+                analysis = stored[1]
+            
+            if analysis['changed'] or include_unchanged:
+                results[node_id] = analysis
+            else:
+                unchanged += 1
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'unchanged': unchanged,
+            'stale': stale
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/async/normalize', methods=['POST'])
+def normalize_labels_coalesced():
+    """Normalize a list of labels, sharing work between identical batches."""
+    try:
+        data = request.get_json()
+        labels = data.get('labels', [])
+        
+        results = coalescer.run(batch_digest('normalize', labels),
+                                lambda: batch_normalizer.analyze_batch(labels))
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/async/analyze', methods=['POST'])
+def analyze_text_coalesced():
+    """Analyze a single text, sharing work between identical requests."""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        
+        analysis = coalescer.run(batch_digest('analyze', text),
+                                 lambda: normalizer.analyze_text(text))
+        
+        return jsonify({
+            'success': True,
+            'analysis': analysis
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/admin/terms', methods=['GET'])
+def term_dictionaries():
+    """Version of the loaded term snapshot and of each domain dictionary."""
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        abort(403)
+    return jsonify({
+        'success': True,
+        'snapshot': normalizer.snapshot.info()
+    })
+
+@app.route('/admin/terms/reload', methods=['POST'])
+def reload_term_dictionaries():
+    """Reload the term dictionaries now instead of waiting for the file watch."""
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        abort(403)
+    try:
+        changed_terms, invalidated = apply_term_reload()
+        return jsonify({
+            'success': True,
+            'snapshot': normalizer.snapshot.info(),
+            'changed_terms': sorted(changed_terms),
+            'invalidated': invalidated
+        })
+    
+    except (OSError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'snapshot': normalizer.snapshot.info()
+        }), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         'status': 'healthy',
-        'service': 'Intelligent Label Normalization Service'
+        'service': 'Intelligent Label Normalization Service',
+        'word_cache': normalizer.word_cache.stats(),
+        'coalescer': coalescer.stats(),
+        'incremental': incremental_results.stats(),
+        'terms': normalizer.snapshot.version,
+        'result_store': result_store.stats() if result_store is not None else None
     })
 
 if __name__ == '__main__':
     print("Starting Intelligent Label Normalization Service...")
     print("Service will be available at http://localhost:5000")
+    print("(Development server - use serve_normalization.py for production)")
     app.run(debug=True, port=5000, host='127.0.0.1')
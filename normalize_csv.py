@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Offline catalog normalization
+Streams a catalog CSV through the IntelligentNormalizer, in chunks spread
+over worker processes, and writes a corrected CSV plus a report of every
+label it changed, without going through the HTTP service
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from encoding_detection import detect_encoding
+from normalization_service import IntelligentNormalizer
+
+DEFAULT_CHUNK_ROWS = 2000
+# Chunks queued per worker; bounds how many rows are held in memory at once
+CHUNKS_PER_WORKER = 2
+
+REPORT_COLUMNS = ['row', 'id', 'column', 'original', 'normalized', 'changed_words', 'preserved_terms']
+
+# Per-process normalizer, built once by the pool initializer
+_worker_normalizer = None
+
+
+def _init_worker():
+    """Warm a normalizer in a pool worker"""
+    global _worker_normalizer
+    _worker_normalizer = IntelligentNormalizer()
+    _worker_normalizer.warm_up()
+
+
+def normalize_labels(normalizer, columns):
+    """Analyze each column's labels, keeping only what the outputs need
+
+    Returns one list per column holding None for unchanged labels and
+    (normalized, changed words, preserved terms) for changed ones.
+    """
+    return [
+        [(analysis['normalized'],
+          '; '.join(f"{word['original']}→{word['normalized']}" for word in analysis['normalized_words']),
+          '; '.join(analysis['preserved_terms'])) if analysis['changed'] else None
+         for analysis in normalizer.analyze_batch(labels)]
+        for labels in columns
+    ]
+
+
+def _normalize_in_worker(columns):
+    return normalize_labels(_worker_normalizer, columns)
+
+
+def default_paths(input_path):
+    """<stem>_normalized.csv and <stem>_normalization_changes.csv next to the input"""
+    input_path = Path(input_path)
+    return (input_path.with_name(f"{input_path.stem}_normalized.csv"),
+            input_path.with_name(f"{input_path.stem}_normalization_changes.csv"))
+
+
+def is_label(value):
+    """Whether a CSV field holds a label (NULL and empty fields are left alone)"""
+    return bool(value) and value != 'NULL'
+
+
+class QuotedCatalogWriter:
+    """csv.writer stand-in for fully quoted catalog exports
+
+    Quotes every field except bare NULLs, the way the catalog exports write
+    them (csv.QUOTE_ALL would turn NULL into the string "NULL").
+    """
+
+    def __init__(self, output_file):
+        self._file = output_file
+
+    def writerow(self, row):
+        self._file.write(','.join(value if value == 'NULL' else '"' + value.replace('"', '""') + '"'
+                                  for value in row) + '\r\n')
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+
+def iter_chunks(reader, chunk_rows):
+    """Yield lists of up to chunk_rows rows, skipping blank lines"""
+    chunk = []
+    for row in reader:
+        if not row:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def normalize_csv(input_path, output_path=None, report_path=None, columns=('name',),
+                  workers=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write a normalized copy of a catalog CSV and a change report
+
+    Rows are read, normalized and written in chunks, with at most
+    CHUNKS_PER_WORKER chunks per worker in flight, so memory stays bounded
+    however large the file is. Output rows keep the input's order and
+    columns; rows with missing or extra fields are written back as they were
+    read. Returns the output paths and counters.
+    """
+    default_output, default_report = default_paths(input_path)
+    output_path = output_path or default_output
+    report_path = report_path or default_report
+    workers = workers or os.cpu_count() or 1
+    if Path(input_path).resolve() in (Path(output_path).resolve(), Path(report_path).resolve()):
+        raise ValueError("The corrected CSV and the change report must not overwrite the input file")
+
+    encoding = detect_encoding(input_path)
+    output_encoding = 'utf-8-sig' if encoding == 'utf-8-sig' else 'utf-8'
+    start = time.perf_counter()
+    rows_written = 0
+    labels = 0
+    changed = 0
+
+    with open(input_path, 'r', encoding=encoding, newline='') as input_file:
+        # Keep fully quoted files fully quoted
+        fully_quoted = input_file.read(1) == '"'
+        input_file.seek(0)
+
+        # Rows stay lists so ragged rows pass through untouched
+        reader = csv.reader(input_file)
+        fieldnames = next(reader, [])
+        missing = [column for column in columns if column not in fieldnames]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}. Available columns: {fieldnames}")
+        positions = [fieldnames.index(column) for column in columns]
+        id_position = fieldnames.index('id') if 'id' in fieldnames else None
+
+        # Outputs are only opened (and truncated) once the input is known to be usable
+        with open(output_path, 'w', encoding=output_encoding, newline='') as output_file, \
+                open(report_path, 'w', encoding=output_encoding, newline='') as report_file:
+            writer = QuotedCatalogWriter(output_file) if fully_quoted else csv.writer(output_file)
+            writer.writerow(fieldnames)
+            report = csv.writer(report_file)
+            report.writerow(REPORT_COLUMNS)
+
+            def write_chunk(first_row, chunk, results):
+                nonlocal rows_written, changed
+                for offset, row in enumerate(chunk):
+                    for column, position, column_results in zip(columns, positions, results):
+                        result = column_results[offset]
+                        if result is not None:
+                            normalized, changed_words, preserved_terms = result
+                            row_id = row[id_position] if id_position is not None and id_position < len(row) else ''
+                            report.writerow([first_row + offset, row_id, column,
+                                             row[position], normalized, changed_words, preserved_terms])
+                            row[position] = normalized
+                            changed += 1
+                writer.writerows(chunk)
+                rows_written += len(chunk)
+
+            def labels_of(chunk):
+                nonlocal labels
+                values = [[row[position] if position < len(row) and is_label(row[position]) else '' for row in chunk]
+                          for position in positions]
+                labels += sum(1 for column_values in values for value in column_values if value)
+                return values
+
+            chunks = iter_chunks(reader, chunk_rows)
+            next_row = 1
+            if workers <= 1:
+                normalizer = IntelligentNormalizer()
+                for chunk in chunks:
+                    write_chunk(next_row, chunk, normalize_labels(normalizer, labels_of(chunk)))
+                    next_row += len(chunk)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                    in_flight = deque()
+                    for chunk in chunks:
+                        in_flight.append((next_row, chunk, pool.submit(_normalize_in_worker, labels_of(chunk))))
+                        next_row += len(chunk)
+                        if len(in_flight) >= workers * CHUNKS_PER_WORKER:
+                            first_row, done, future = in_flight.popleft()
+                            write_chunk(first_row, done, future.result())
+                    while in_flight:
+                        first_row, done, future = in_flight.popleft()
+                        write_chunk(first_row, done, future.result())
+
+    seconds = time.perf_counter() - start
+    return {
+        'output_path': str(output_path),
+        'report_path': str(report_path),
+        'encoding': encoding,
+        'rows': rows_written,
+        'labels': labels,
+        'changed': changed,
+        'workers': workers,
+        'seconds': seconds,
+        'rows_per_second': rows_written / seconds if seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Normalize catalog labels in a CSV file without the HTTP service",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 normalize_csv.py current_offerings_nodes_10092025.csv
+  python3 normalize_csv.py nodes.csv --german -o nodes_clean.csv
+  python3 normalize_csv.py nodes.csv --workers 4 --chunk-rows 5000
+
+Writes <input>_normalized.csv (same rows and columns, corrected labels) and
+<input>_normalization_changes.csv (row, id, column, original, normalized,
+changed_words, preserved_terms for every changed label). NULL and empty
+fields are left as they are.
+        """
+    )
+    parser.add_argument('input_file', help='Catalog CSV with a name column')
+    parser.add_argument('-o', '--output', help='Corrected CSV path (default: <input>_normalized.csv)')
+    parser.add_argument('--report', help='Change report path (default: <input>_normalization_changes.csv)')
+    parser.add_argument('--german', action='store_true', help='Also normalize the name_de column')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count, 1 = in-process)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help='Rows per chunk handed to a worker (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    try:
+        columns = ('name', 'name_de') if args.german else ('name',)
+        print(f"📁 Normalizing {', '.join(columns)} in {args.input_file}")
+        stats = normalize_csv(args.input_file, args.output, args.report, columns=columns,
+                              workers=args.workers, chunk_rows=args.chunk_rows)
+        print(f"✅ {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_second']:,.0f} rows/sec, {stats['workers']} worker(s), {stats['encoding']})")
+        print(f"📝 {stats['changed']:,} of {stats['labels']:,} labels changed")
+        print(f"💾 Corrected CSV: {stats['output_path']}")
+        print(f"📋 Change report: {stats['report_path']}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
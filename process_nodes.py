@@ -5,10 +5,14 @@ Script to process nodes.csv and create:
 2. A Mermaid diagram for visualization
 """
 
+import argparse
 import csv
-import json
 from collections import defaultdict
 
+from hierarchy_builder import build_hierarchy
+from hierarchy_stats import save_statistics, statistics_from_nodes
+from hierarchy_writer import save_hierarchy_json
+
 def clean_field(field):
     """Remove quotes and handle NULL values"""
     if field == 'NULL' or field == '':
@@ -49,44 +53,28 @@ def process_csv(filename):
     
     return nodes, children_map
 
-def create_json_structure(nodes):
+def create_json_structure(nodes, children_map):
     """Create a hierarchical JSON structure"""
-    # Find root nodes (those with no parent or NULL parent)
-    root_nodes = []
+    # Root nodes are those with no parent or NULL parent
+    root_nodes, report = build_hierarchy(nodes, children_map)
     
-    for node_id, node in nodes.items():
-        if node['pid'] is None:
-            root_nodes.append(build_tree(node_id, nodes))
+    for cycle in report['cycles']:
+        print(f"Skipping parent cycle: {' -> '.join(cycle + cycle[:1])}")
     
     return root_nodes
 
-def build_tree(node_id, nodes):
-    """Recursively build tree structure"""
-    if node_id not in nodes:
-        return None
-    
-    node = nodes[node_id].copy()
-    node['children'] = []
-    
-    for child_id in nodes[node_id]['children']:
-        child_tree = build_tree(child_id, nodes)
-        if child_tree:
-            node['children'].append(child_tree)
-    
-    return node
-
-def create_mermaid_diagram(nodes, max_depth=3):
+def create_mermaid_diagram(nodes, children_map, max_depth=3):
     """Create a Mermaid diagram (limited depth to avoid overwhelming output)"""
     mermaid_lines = ["graph TD"]
     
     # Start with root nodes
     for node_id, node in nodes.items():
         if node['pid'] is None:
-            add_mermaid_nodes(node_id, nodes, mermaid_lines, 0, max_depth)
+            add_mermaid_nodes(node_id, nodes, children_map, mermaid_lines, 0, max_depth)
     
     return "\n".join(mermaid_lines)
 
-def add_mermaid_nodes(node_id, nodes, mermaid_lines, current_depth, max_depth):
+def add_mermaid_nodes(node_id, nodes, children_map, mermaid_lines, current_depth, max_depth):
     """Recursively add nodes to mermaid diagram"""
     if current_depth > max_depth or node_id not in nodes:
         return
@@ -102,7 +90,7 @@ def add_mermaid_nodes(node_id, nodes, mermaid_lines, current_depth, max_depth):
     mermaid_lines.append(f'    {node_id}["{clean_name}"]')
     
     # Add connections to children
-    for child_id in node['children']:
+    for child_id in children_map.get(node_id, []):
         if child_id in nodes:
             child_node = nodes[child_id]
             child_clean_name = child_node['name'].replace('"', '').replace("'", "").replace("[", "").replace("]", "")
@@ -113,9 +101,13 @@ def add_mermaid_nodes(node_id, nodes, mermaid_lines, current_depth, max_depth):
             mermaid_lines.append(f'    {node_id} --> {child_id}')
             
             # Recursively add children
-            add_mermaid_nodes(child_id, nodes, mermaid_lines, current_depth + 1, max_depth)
+            add_mermaid_nodes(child_id, nodes, children_map, mermaid_lines, current_depth + 1, max_depth)
 
 def main():
+    parser = argparse.ArgumentParser(description="Create nodes_hierarchy.json and Mermaid diagrams from nodes.csv")
+    parser.add_argument('--stats-json', help='Also write the hierarchy statistics as JSON to this path')
+    args = parser.parse_args()
+    
     # Process the CSV file
     print("Processing nodes.csv...")
     nodes, children_map = process_csv('nodes.csv')
@@ -125,17 +117,16 @@ def main():
     
     # Create hierarchical JSON structure
     print("Creating JSON structure...")
-    json_structure = create_json_structure(nodes)
+    json_structure = create_json_structure(nodes, children_map)
     
     # Save JSON file
-    with open('nodes_hierarchy.json', 'w', encoding='utf-8') as f:
-        json.dump(json_structure, f, indent=2, ensure_ascii=False)
+    save_hierarchy_json(json_structure, 'nodes_hierarchy.json')
     
     print("Created nodes_hierarchy.json")
     
     # Create Mermaid diagram
     print("Creating Mermaid diagram...")
-    mermaid_content = create_mermaid_diagram(nodes, max_depth=2)  # Limit depth for readability
+    mermaid_content = create_mermaid_diagram(nodes, children_map, max_depth=2)  # Limit depth for readability
     
     # Save Mermaid file
     with open('organigram.mmd', 'w', encoding='utf-8') as f:
@@ -168,12 +159,14 @@ def main():
     print("Created organigram.html for viewing the diagram")
     
     # Print some statistics
-    level_counts = defaultdict(int)
-    for node in nodes.values():
-        level_counts[node['level']] += 1
+    stats = statistics_from_nodes(nodes)
+    if args.stats_json:
+        save_statistics(stats, args.stats_json)
+        print(f"Created {args.stats_json}")
     
+    print(f"\nMax depth: {stats['max_depth']}")
     print("\nLevel distribution:")
-    for level, count in sorted(level_counts.items()):
+    for level, count in stats['levels'].items():
         print(f"  {level}: {count} nodes")
 
 if __name__ == "__main__":
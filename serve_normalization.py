@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Production server for the Intelligent Label Normalization Service
+Runs the Flask app under gunicorn when available, otherwise under a
+pure-Python pre-forking Werkzeug server. The normalizer is warmed up before
+workers are forked so they share the dictionary pages copy-on-write.
+"""
+
+import argparse
+import os
+import signal
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from normalization_service import app, batch_normalizer, normalizer
+
+
+def env_int(name, default):
+    """Read an integer setting from the environment"""
+    return int(os.environ.get(name, default))
+
+
+def prepare_app(args):
+    """Apply limits and warm the normalizer in the parent process"""
+    app.config['MAX_CONTENT_LENGTH'] = args.max_request_size
+    app.debug = False
+
+    # Server workers already use every core, so don't fan out again per request
+    if args.workers > 1:
+        batch_normalizer.workers = args.pool_workers
+
+    words = normalizer.warm_up()
+    print(f"📚 Dictionary loaded ({words:,} words), preloaded before forking")
+
+
+def serve_gunicorn(args):
+    """Serve with gunicorn using a preloaded application"""
+    from gunicorn.app.base import BaseApplication
+
+    class NormalizationApplication(BaseApplication):
+        def load_config(self):
+            settings = {
+                'bind': f"{args.host}:{args.port}",
+                'workers': args.workers,
+                'threads': args.threads,
+                'keepalive': args.keep_alive,
+                'preload_app': True,
+                'timeout': args.timeout,
+                'limit_request_line': 8190,
+                'accesslog': '-' if args.access_log else None,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    NormalizationApplication().run()
+
+
+def serve_prefork(args):
+    """Serve with Werkzeug, forking worker processes that share one socket"""
+    class KeepAliveRequestHandler(WSGIRequestHandler):
+        # HTTP/1.1 keeps connections open; idle ones are closed after `timeout`
+        protocol_version = 'HTTP/1.1'
+        timeout = args.keep_alive
+
+        def log_request(self, code='-', size='-'):
+            if args.access_log:
+                super().log_request(code, size)
+
+    server = make_server(args.host, args.port, app, threaded=args.threads > 1,
+                         request_handler=KeepAliveRequestHandler)
+    if args.threads > 1:
+        server.daemon_threads = True
+
+    if args.workers <= 1 or not hasattr(os, 'fork'):
+        server.serve_forever()
+        return
+
+    children = set()
+    shutting_down = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(args.workers):
+        spawn()
+
+    # Reap workers, replacing any that die unexpectedly
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not shutting_down:
+            print(f"⚠️  Worker {pid} exited, starting a replacement")
+            spawn()
+
+    server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the label normalization service with multiple workers",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 serve_normalization.py
+  python3 serve_normalization.py --workers 8 --port 5000
+  python3 serve_normalization.py --server prefork --threads 4
+
+Settings can also be given as NORMALIZER_HOST, NORMALIZER_PORT,
+NORMALIZER_SERVER_WORKERS, NORMALIZER_SERVER_THREADS, NORMALIZER_KEEP_ALIVE
+and NORMALIZER_MAX_REQUEST_SIZE environment variables.
+        """
+    )
+    parser.add_argument('--host', default=os.environ.get('NORMALIZER_HOST', '127.0.0.1'), help='Interface to bind')
+    parser.add_argument('--port', type=int, default=env_int('NORMALIZER_PORT', 5000), help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=env_int('NORMALIZER_SERVER_WORKERS', os.cpu_count() or 1),
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--threads', type=int, default=env_int('NORMALIZER_SERVER_THREADS', 2),
+                        help='Request threads per worker')
+    parser.add_argument('--keep-alive', type=int, default=env_int('NORMALIZER_KEEP_ALIVE', 5),
+                        help='Seconds to hold idle keep-alive connections open')
+    parser.add_argument('--max-request-size', type=int, default=env_int('NORMALIZER_MAX_REQUEST_SIZE', 16 * 1024 * 1024),
+                        help='Largest accepted request body in bytes (larger requests get 413)')
+    parser.add_argument('--timeout', type=int, default=120, help='Seconds before gunicorn restarts a stuck worker')
+    parser.add_argument('--pool-workers', type=int, default=1,
+                        help='Batch normalization processes per server worker when --workers > 1')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stdout')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'prefork'], default='auto',
+                        help='Server implementation (auto: gunicorn if installed)')
+
+    args = parser.parse_args()
+
+    server = args.server
+    if server == 'auto':
+        try:
+            import gunicorn  # noqa: F401
+            server = 'gunicorn'
+        except ImportError:
+            server = 'prefork'
+
+    prepare_app(args)
+    print(f"🚀 Starting Intelligent Label Normalization Service ({server}, "
+          f"{args.workers} worker(s) x {args.threads} thread(s))")
+    print(f"Service will be available at http://{args.host}:{args.port}")
+
+    if server == 'gunicorn':
+        serve_gunicorn(args)
+    else:
+        serve_prefork(args)
+
+
+if __name__ == "__main__":
+    main()
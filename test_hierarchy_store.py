@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test the binary hierarchy store with ids that are not strings and missing levels
+"""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hierarchy_store import HierarchyStore, write_store
+
+def test_integer_ids():
+    root_nodes = [{'id': 1, 'name': 'Root', 'pid': None, 'level': None, 'children': [
+        {'id': 2, 'name': 'Child', 'pid': 1, 'level': 'l2', 'children': []},
+    ]}]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'hierarchy.orgh')
+        write_store(root_nodes, path)
+        with HierarchyStore(path) as store:
+            assert len(store) == 2
+            assert store.node(1) == {'id': '1', 'name': 'Root', 'pid': None, 'level': None}
+            assert store.node('2') == {'id': '2', 'name': 'Child', 'pid': '1', 'level': 'l2'}
+            assert [node['id'] for node in store.parent_chain(2)] == ['1']
+            assert [node['id'] for node in store.children(1)] == ['2']
+
+if __name__ == "__main__":
+    test_integer_ids()
+    print("✅ Hierarchy store tests passed")
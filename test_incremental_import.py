@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test that incremental imports never patch an output they no longer describe
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from import_cache import ImportCache
+from import_organigram import OrganigramImporter
+from incremental_import import manifest_path
+
+def write_csv(path, name):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"name,id,pid,level\n{name},1,NULL,l1\n{name} child,2,1,l2\n")
+
+def root_name(output_path):
+    with open(output_path, 'r', encoding='utf-8') as f:
+        return json.load(f)[0]['name']
+
+def test_output_rewritten_after_incremental_import():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x_path = os.path.join(tmp_dir, 'x.csv')
+        y_path = os.path.join(tmp_dir, 'y.csv')
+        output_path = os.path.join(tmp_dir, 'out.json')
+        write_csv(x_path, 'Foo')
+        write_csv(y_path, 'Bar')
+
+        OrganigramImporter().import_file(x_path, output_path, incremental=True)
+        # A plain import of the same length replaces the output but not the manifest
+        OrganigramImporter().import_file(y_path, output_path)
+        assert root_name(output_path) == 'Bar'
+
+        OrganigramImporter().import_file(x_path, output_path, incremental=True)
+        assert root_name(output_path) == 'Foo'
+
+def test_unchanged_incremental_import_writes_compressed_copy():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x_path = os.path.join(tmp_dir, 'x.csv')
+        output_path = os.path.join(tmp_dir, 'out.json')
+        write_csv(x_path, 'Foo')
+
+        OrganigramImporter().import_file(x_path, output_path, incremental=True)
+        assert not os.path.exists(f"{output_path}.gz")
+
+        OrganigramImporter().import_file(x_path, output_path, incremental=True, compress='gzip')
+        with gzip.open(f"{output_path}.gz", 'rt', encoding='utf-8') as f, \
+                open(output_path, 'r', encoding='utf-8') as output:
+            assert f.read() == output.read()
+
+def test_output_restored_from_cache_after_incremental_import():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        x_path = os.path.join(tmp_dir, 'x.csv')
+        y_path = os.path.join(tmp_dir, 'y.csv')
+        output_path = os.path.join(tmp_dir, 'out.json')
+        cache = ImportCache(os.path.join(tmp_dir, 'cache'))
+        write_csv(x_path, 'Foo')
+        write_csv(y_path, 'Bar')
+
+        OrganigramImporter().import_file(y_path, output_path, cache=cache)
+        OrganigramImporter().import_file(x_path, output_path, incremental=True)
+        assert os.path.exists(manifest_path(output_path))
+
+        # Cache hit for the other input: restored outputs drop the manifest
+        _, stats = OrganigramImporter().import_file(y_path, output_path, cache=cache)
+        assert stats is not None and root_name(output_path) == 'Bar'
+        assert not os.path.exists(manifest_path(output_path))
+
+        OrganigramImporter().import_file(x_path, output_path, incremental=True)
+        assert root_name(output_path) == 'Foo'
+
+if __name__ == "__main__":
+    test_output_rewritten_after_incremental_import()
+    test_unchanged_incremental_import_writes_compressed_copy()
+    test_output_restored_from_cache_after_incremental_import()
+    print("✅ Incremental import tests passed")
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Test incremental normalization passes for nodes without a name
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from normalization_service import app, label_hash
+
+def test_null_label():
+    # labelHash() in index.html hashes a null name as the empty string
+    assert label_hash(None) == label_hash('') == '811c9dc5'
+
+    client = app.test_client()
+    entries = [['null-label-node', label_hash('')]]
+    first = client.post('/normalize/incremental', json={'entries': entries}).get_json()
+    assert first['stale'] == ['null-label-node']
+
+    second = client.post('/normalize/incremental', json={
+        'entries': entries, 'labels': {'null-label-node': None}}).get_json()
+    assert second['success'] and second['stale'] == []
+
+    # The next pass is answered from the stored analysis
+    third = client.post('/normalize/incremental', json={'entries': entries}).get_json()
+    assert third['stale'] == [] and third['unchanged'] == 1
+
+if __name__ == "__main__":
+    test_null_label()
+    print("✅ Incremental normalization tests passed")